@@ -5,7 +5,8 @@ Loads settings from environment variables with sensible defaults.
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from types import MappingProxyType
+from typing import NamedTuple, Optional
 from dotenv import load_dotenv
 
 
@@ -44,6 +45,7 @@ class Config:
     copy_max_sol: float  # Maximum SOL per copy trade
     copy_min_sol: float  # Minimum SOL to trigger copy
     copy_poll_interval_ms: int  # How often to poll wallets
+    copy_ws_url: Optional[str]  # logsSubscribe websocket for push detection (polling becomes a backstop)
     copy_sells: bool  # Whether to copy sells
     copy_proportional: bool  # If true, match trader's % instead of fixed amount
     exit_fee_reserve: float  # SOL reserved per open position for exit fees
@@ -60,6 +62,7 @@ class Config:
     trust_trader_pumpfun: bool  # If true, skip all filters for pump.fun tokens and trust trader
     mock_trading: bool  # If true, simulate trades without sending transactions
     mock_balance_sol: float  # Starting SOL balance for mock trading
+    balance_cache_ms: int  # Reuse our fetched SOL balance for this long (buys are debited from it, sells invalidate it)
     
     # Position Management
     max_positions: int  # Maximum concurrent positions
@@ -138,6 +141,7 @@ def load_config() -> Config:
         copy_max_sol=float(os.getenv('COPY_MAX_SOL', '0.5')),  # Max 0.5 SOL per trade
         copy_min_sol=float(os.getenv('COPY_MIN_SOL', '0.05')),  # Only copy trades > 0.05 SOL
         copy_poll_interval_ms=int(os.getenv('COPY_POLL_INTERVAL_MS', '1000')),  # Poll every 1 sec (faster!)
+        copy_ws_url=os.getenv('COPY_WS_URL') or None,  # e.g. wss://mainnet.helius-rpc.com/?api-key=...
         copy_sells=os.getenv('COPY_SELLS', 'true').lower() == 'true',
         copy_proportional=os.getenv('COPY_PROPORTIONAL', 'true').lower() == 'true',  # Match trader's %
         exit_fee_reserve=float(os.getenv('EXIT_FEE_RESERVE', '0.001')),  # 0.001 SOL per position for exit fees
@@ -154,6 +158,7 @@ def load_config() -> Config:
         trust_trader_pumpfun=os.getenv('TRUST_TRADER_PUMPFUN', 'true').lower() == 'true',  # Trust trader for pump.fun
         mock_trading=os.getenv('MOCK_TRADING', 'false').lower() == 'true',
         mock_balance_sol=float(os.getenv('MOCK_BALANCE_SOL', '1')),
+        balance_cache_ms=int(os.getenv('BALANCE_CACHE_MS', '5000')),  # Skip getBalance for 5s between copies
         
         # Position Management
         max_positions=int(os.getenv('MAX_POSITIONS', '3')),  # Max 3 positions at once
@@ -168,54 +173,29 @@ def load_config() -> Config:
     )
 
 
+class TokenInfo(NamedTuple):
+    """Static token definition."""
+    mint: str
+    decimals: int
+    symbol: str
+
+
 # Token definitions for triangular arbitrage
-# Format: symbol -> (mint_address, decimals)
-TOKENS = {
-    'SOL': {
-        'mint': 'So11111111111111111111111111111111111111112',
-        'decimals': 9,
-        'symbol': 'SOL'
-    },
-    'USDC': {
-        'mint': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',
-        'decimals': 6,
-        'symbol': 'USDC'
-    },
-    'USDT': {
-        'mint': 'Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB',
-        'decimals': 6,
-        'symbol': 'USDT'
-    },
-    'ETH': {
-        'mint': '7vfCXTUXx5WJV5JADk17DUJ4ksgau7utNKj4b963voxs',  # Wormhole ETH
-        'decimals': 8,
-        'symbol': 'ETH'
-    },
-    'BTC': {
-        'mint': '3NZ9JMVBmGAqocybic2c7LQCJScmgsAZ6vQqTDzcqmJh',  # Wormhole BTC
-        'decimals': 8,
-        'symbol': 'BTC'
-    },
-    'RAY': {
-        'mint': '4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R',
-        'decimals': 6,
-        'symbol': 'RAY'
-    },
-}
+# Format: symbol -> TokenInfo (read-only, built once at import)
+TOKENS = MappingProxyType({
+    'SOL': TokenInfo(mint='So11111111111111111111111111111111111111112', decimals=9, symbol='SOL'),
+    'USDC': TokenInfo(mint='EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v', decimals=6, symbol='USDC'),
+    'USDT': TokenInfo(mint='Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB', decimals=6, symbol='USDT'),
+    'ETH': TokenInfo(mint='7vfCXTUXx5WJV5JADk17DUJ4ksgau7utNKj4b963voxs', decimals=8, symbol='ETH'),  # Wormhole ETH
+    'BTC': TokenInfo(mint='3NZ9JMVBmGAqocybic2c7LQCJScmgsAZ6vQqTDzcqmJh', decimals=8, symbol='BTC'),  # Wormhole BTC
+    'RAY': TokenInfo(mint='4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R', decimals=6, symbol='RAY'),
+})
 
 # Devnet tokens (different addresses)
-TOKENS_DEVNET = {
-    'SOL': {
-        'mint': 'So11111111111111111111111111111111111111112',
-        'decimals': 9,
-        'symbol': 'SOL'
-    },
-    'USDC': {
-        'mint': '4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU',  # Devnet USDC
-        'decimals': 6,
-        'symbol': 'USDC'
-    },
-}
+TOKENS_DEVNET = MappingProxyType({
+    'SOL': TokenInfo(mint='So11111111111111111111111111111111111111112', decimals=9, symbol='SOL'),
+    'USDC': TokenInfo(mint='4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU', decimals=6, symbol='USDC'),  # Devnet USDC
+})
 
 # Default triangular paths to scan
 # Each path is a tuple of 3 token symbols: (A, B, C) meaning A -> B -> C -> A
@@ -229,5 +209,6 @@ ESTIMATED_TX_COST_SOL = 0.01
 
 # Rate limiting - very conservative for free Jupiter API
 MAX_REQUESTS_PER_SECOND = 0.5  # 1 request per 2 seconds
+JUPITER_MAX_REQUESTS_PER_SECOND = 1.0  # lite-api free tier (~60 req/min) for background quotes
 BACKOFF_BASE_SECONDS = 1.0
 BACKOFF_MAX_SECONDS = 60.0
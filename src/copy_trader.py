@@ -5,19 +5,29 @@ Monitors wallets, detects trades, and executes copies.
 
 import asyncio
 import aiohttp
+import base64
 import json
 import os
+import orjson
+import random
+import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import partial
 from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 import structlog
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
 
 from .wallet_monitor import WalletMonitor, WalletTransaction
 from .tx_parser import TransactionParser, ParsedSwap, SwapType
 from .config import Config
-from .position_manager import PositionManager
+from .position_manager import PositionManager, ExitReason
 from .trade_logger import trade_logger
 
 logger = structlog.get_logger(__name__)
@@ -25,15 +35,85 @@ logger = structlog.get_logger(__name__)
 # Jupiter API for swaps - using lite-api (public, no auth required)
 JUPITER_QUOTE_API = "https://lite-api.jup.ag/v6/quote"
 JUPITER_SWAP_API = "https://lite-api.jup.ag/v6/swap"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 # Pump.fun API for bonding curve trades
 PUMPFUN_API = "https://pumpportal.fun/api/trade-local"
 
+# DexScreener token stats (market cap, liquidity, age) used by the buy filters
+DEXSCREENER_HOST = "https://api.dexscreener.com"
+DEXSCREENER_TOKENS_API = f"{DEXSCREENER_HOST}/latest/dex/tokens"
+# Token lookups sit on the buy path - tighter than the shared session's default
+DEXSCREENER_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# Token lookups made within this window share one request (the endpoint takes up to 30 mints)
+DEXSCREENER_BATCH_WINDOW_SECONDS = 0.02
+DEXSCREENER_BATCH_MAX_MINTS = 30
+
+# (signature, wallet) pairs remembered to drop re-delivered transactions before parsing
+PROCESSED_TX_CACHE_SIZE = 1024
+
+# Lamports per SOL, and the step trade sizes are rounded to (0.0001 SOL)
+LAMPORTS_PER_SOL = 1_000_000_000
+TRADE_SIZE_STEP_LAMPORTS = 100_000
+
+# Most tokens kept in each token/holder info cache (least recently used evicted first)
+TOKEN_CACHE_MAX_SIZE = 2048
+
+# Extra SOL a buy costs on top of its size: priority fee + new token account rent, rounded up.
+# Subtracted from our cached balance so back-to-back buys don't need a getBalance in between.
+BUY_COST_OVERHEAD_LAMPORTS = 3_000_000
+
+# Per-wallet backlog of detected transactions waiting to be copied
+TX_QUEUE_MAXSIZE = 256
+
+# Copied-sell retries: exponential backoff from this base, +/- this fraction of jitter
+SELL_RETRY_BASE_SECONDS = 0.5
+SELL_RETRY_JITTER = 0.3
+
+# A speculative quote is reused if its amount is within this fraction below the final size
+SPECULATIVE_QUOTE_MIN_FILL = 0.95
+
+# How long a bought token is blocked from being re-bought
+RECENT_COPY_TTL_SECONDS = 30
+RECENT_COPY_PRUNE_SIZE = 64  # Sweep expired entries once the dict gets this big
+
+# Jupiter quotes are reused for a couple of seconds when several wallets copy the same token
+QUOTE_CACHE_TTL_SECONDS = 2.0
+QUOTE_CACHE_MAX_SIZE = 256  # Sweep expired quotes once the cache gets this big
+
+# Trader SOL balances for proportional sizing: how long one is trusted, and how
+# often the background refresher re-fetches the ones close to expiring
+TRADER_BALANCE_TTL_SECONDS = 30
+TRADER_BALANCE_REFRESH_SECONDS = 15
+TRADER_BALANCE_DEFAULT_SOL = 10.0  # Assumed when the lookup fails
+
+# HTTP connection pool for Jupiter / pump.fun / DexScreener (shared with PositionManager)
+HTTP_CONNECTION_LIMIT = 64
+HTTP_CONNECTION_LIMIT_PER_HOST = 32
+HTTP_DNS_CACHE_TTL_SECONDS = 300
+HTTP_KEEPALIVE_TIMEOUT_SECONDS = 75
+# Default bounds for every call on the shared session (calls can still pass a tighter one)
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=5)
+
+# Skip reasons returned by _should_copy (constant so the skip path builds no strings)
+SKIP_SELL_COOLDOWN = "sell_cooldown_active"
+SKIP_BELOW_MIN_SOL = "below_min_sol"
+SKIP_RECENTLY_COPIED = "recently_copied"
+SKIP_SELL_DISABLED = "sell_disabled"
+
 # Native SOL
 NATIVE_SOL = "So11111111111111111111111111111111111111112"
 
+# Tiny SOL -> USDC quote used to open the Jupiter connection before the first copy
+WARMUP_QUOTE_PARAMS = {
+    "inputMint": NATIVE_SOL,
+    "outputMint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "amount": "1000000",
+    "slippageBps": "50"
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class CopyTradeResult:
     """Result of a copy trade execution."""
     success: bool
@@ -42,9 +122,10 @@ class CopyTradeResult:
     original_swap: Optional[ParsedSwap] = None
     our_sol_amount: int = 0
     mock: bool = False
+    sent: bool = False  # Failed, but only after the tx was handed to the RPC (it may still land)
     
 
-@dataclass
+@dataclass(slots=True)
 class TradeStats:
     """Statistics for copy trading."""
     total_detected: int = 0
@@ -53,7 +134,6 @@ class TradeStats:
     total_failed: int = 0
     total_sol_spent: float = 0.0
     total_sol_received: float = 0.0
-    tokens_held: Dict[str, int] = field(default_factory=dict)
 
 
 class CopyTrader:
@@ -69,10 +149,37 @@ class CopyTrader:
         rpc_client,      # RPCClient from rpc.py
     ):
         self.config = config
-        self.target_wallets = target_wallets
         self.wallet = wallet_keypair
+        
+        # Interned so every dict keyed by wallet (and the monitor's lookups) hits the identity fast path
+        target_wallets = [sys.intern(w) for w in target_wallets]
+        
+        # Decode trader pubkeys once - an address that doesn't parse can't be monitored either
+        self._trader_pubkeys: Dict[str, Pubkey] = {}
+        for w in target_wallets:
+            try:
+                self._trader_pubkeys[w] = Pubkey.from_string(w)
+            except ValueError:
+                logger.warning("invalid_wallet_skipped", wallet=w)
+        self.target_wallets = [w for w in target_wallets if w in self._trader_pubkeys]
+        # Short wallet labels for logs, built once
+        self._wallet_short = {w: w[:8] + "..." for w in self.target_wallets}
         self.rpc = rpc_client
         
+        # Per-request constants, built once instead of on every swap
+        self._wallet_pubkey = wallet_keypair.pubkey()
+        self._wallet_pubkey_str = str(self._wallet_pubkey)
+        self._signers = [wallet_keypair]
+        self._slippage_bps_str = str(config.slippage_bps)
+        swap_template = {
+            "userPublicKey": self._wallet_pubkey_str,
+            "wrapAndUnwrapSol": True,
+            "dynamicComputeUnitLimit": True,
+            "prioritizationFeeLamports": 500000  # Very high priority ~0.0005 SOL for fastest execution
+        }
+        # Swap request body up to the quote: '{...constant fields...,"quoteResponse":'
+        self._swap_body_prefix = orjson.dumps(swap_template)[:-1] + b',"quoteResponse":'
+        
         # Components
         self.monitor: Optional[WalletMonitor] = None
         self.parser = TransactionParser(min_sol_value=config.copy_min_sol)
@@ -80,11 +187,33 @@ class CopyTrader:
         
         # State
         self.stats = TradeStats()
-        self.recent_copies: Set[str] = set()  # Track recently copied tokens
+        self.recent_copies: Dict[str, float] = {}  # mint -> monotonic deadline before re-buying
+        self._processed_txs: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._buys_in_flight: Set[str] = set()  # Mints with a buy currently being executed
+        # Position slots held by buys that passed the cap but haven't landed yet
+        # (wallets are copied concurrently and add_position only runs after the swap)
+        self._reserved_positions = 0
+        # Lamports set aside by those buys, so concurrent buys don't size from the same balance
+        self._reserved_lamports = 0
+        # (input_mint, output_mint, amount) -> (fetched_at, quote)
+        self._quote_cache: Dict[tuple[str, str, int], tuple[float, Dict]] = {}
+        # Quote requests currently on the wire - concurrent callers await the same one
+        self._inflight_quotes: Dict[tuple[str, str, int], asyncio.Task] = {}
+        # (input_mint, output_mint) -> quote URL up to the amount
+        self._quote_url_prefixes: Dict[tuple[str, str], str] = {}
+        
+        # One queue + consumer per wallet: copies run off the monitor's poll loop,
+        # but each trader's transactions are still handled in order (buy before sell)
+        self._tx_queues: Dict[str, asyncio.Queue] = {}
+        self._tx_consumers: List[asyncio.Task] = []
         self.running = False
         
         # Settings from config
         self.copy_percentage = config.copy_balance_pct / 100.0
+        # Same percentage as an exact integer ratio for lamport math (12.5% -> 1/8)
+        copy_fraction = Fraction(str(config.copy_balance_pct)) / 100
+        self._copy_pct_num = copy_fraction.numerator
+        self._copy_pct_den = copy_fraction.denominator
         self.max_sol_per_trade = config.copy_max_sol
         self.min_sol_per_trade = config.copy_min_sol
         self.copy_sells = config.copy_sells
@@ -92,6 +221,11 @@ class CopyTrader:
         self.copy_proportional = config.copy_proportional
         self.exit_fee_reserve = config.exit_fee_reserve
         self.max_positions = config.max_positions
+        # Same limits in integer lamports for trade sizing
+        self._fee_reserve_lamports = int(round(config.fee_reserve_sol * LAMPORTS_PER_SOL))
+        self._exit_fee_reserve_lamports = int(round(config.exit_fee_reserve * LAMPORTS_PER_SOL))
+        self._max_trade_lamports = int(round(config.copy_max_sol * LAMPORTS_PER_SOL))
+        self._min_trade_lamports = int(round(config.copy_min_sol * LAMPORTS_PER_SOL))
         self.min_market_cap_usd = config.min_market_cap_usd
         self.min_token_age_minutes = config.min_token_age_minutes
         self.min_liquidity_usd = config.min_liquidity_usd
@@ -103,16 +237,64 @@ class CopyTrader:
         self.min_holders_count = config.min_holders_count
         self.trust_trader_pumpfun = config.trust_trader_pumpfun
         
+        # Buy filters as tables, built once with only the enabled ones, in check order.
+        # Each is (metric, limit, is_max, skip event, limit log field, error format).
+        # Trust trader mode skips the token filters entirely.
+        self._token_filters = [] if self.trust_trader_pumpfun else [
+            f for f in (
+                ("age", self.min_token_age_minutes, False, "skipping_new_token", "min_age",
+                 "token_too_new ({value:.1f}m < {limit}m)"),
+                ("market_cap", self.min_market_cap_usd, False, "skipping_low_mcap", "min_required",
+                 "market_cap_too_low (${value:,.0f} < ${limit:,.0f})"),
+                # Liquidity is CRITICAL for being able to sell!
+                ("liquidity", self.min_liquidity_usd, False, "skipping_low_liquidity", "min_required",
+                 "liquidity_too_low (${value:,.0f} < ${limit:,.0f})"),
+                ("volume_24h", self.min_volume_24h_usd, False, "skipping_low_volume", "min_required",
+                 "volume_too_low (${value:,.0f} < ${limit:,.0f})"),
+                # Avoid buying tops
+                ("price_change_1h", self.max_price_change_1h_pct, True, "skipping_already_pumped", "max_allowed",
+                 "already_pumped (+{value:.0f}% > +{limit:.0f}%)"),
+                ("txns_1h", self.min_txns_1h, False, "skipping_low_activity", "min_required",
+                 "low_activity ({value} txns < {limit} min)"),
+            ) if f[1] > 0
+        ]
+        self._holder_filters = [
+            f for f in (
+                ("top10_pct", self.max_top10_holders_pct, True, "skipping_concentrated_holdings", "max_allowed",
+                 "top10_holders_too_high ({value:.1f}% > {limit:.0f}%)"),
+                ("dev_pct", self.max_dev_holdings_pct, True, "skipping_high_dev_holdings", "max_allowed",
+                 "dev_holdings_too_high ({value:.1f}% > {limit:.0f}%)"),
+                ("holders", self.min_holders_count, False, "skipping_low_holders", "min_required",
+                 "too_few_holders ({value} < {limit})"),
+            ) if f[1] > 0
+        ]
+        self._skip_max_positions = f"max_positions_reached ({config.max_positions})"
+        # Sizing mode never changes at runtime - pick the sizing method once
+        self._size_trade = self._size_trade_proportional if config.copy_proportional else self._size_trade_fixed
+        
         # Cache for token info (to avoid repeated API calls)
         # mint -> (market_cap, age_minutes, liquidity, volume_24h, price_change_1h, txns_1h, cache_time)
-        self.token_info_cache: Dict[str, tuple[float, float, float, float, float, int, float]] = {}
+        self.token_info_cache: OrderedDict[str, tuple[float, float, float, float, float, int, float]] = OrderedDict()
+        # DexScreener lookups waiting for the next multi-token request (mint -> future)
+        self._token_info_pending: Dict[str, asyncio.Future] = {}
+        self._token_info_flush: Optional[asyncio.TimerHandle] = None
+        self._token_info_fetches: Set[asyncio.Task] = set()
         
         # Cache for holder info from RugCheck (to avoid repeated API calls)
         # mint -> (top10_pct, dev_pct, holders_count, cache_time)
-        self.holder_info_cache: Dict[str, tuple[float, float, int, float]] = {}
+        self.holder_info_cache: OrderedDict[str, tuple[float, float, int, float]] = OrderedDict()
         
         # Track trader wallet balances for proportional sizing
-        self.trader_balances: Dict[str, float] = {}
+        # wallet -> (balance_sol, monotonic expiry); stale entries are still used while refreshing
+        self._trader_balance_cache: Dict[str, tuple[float, float]] = {}
+        self._trader_balance_refreshes: Dict[str, asyncio.Task] = {}
+        self._trader_balance_task: Optional[asyncio.Task] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+        
+        # Our own SOL balance, reused until stale or until one of our swaps lands
+        self._balance_cache: Optional[tuple[int, float]] = None  # (lamports, monotonic time)
+        self._balance_dirty = True
+        self.balance_cache_seconds = config.balance_cache_ms / 1000.0
         
         # Position manager for auto-sell
         self.position_manager: Optional[PositionManager] = None
@@ -130,6 +312,8 @@ class CopyTrader:
         self.mock_starting_balance = self.config.mock_balance_sol  # Remember starting balance
         # Max age before abandoning - pump.fun tokens rug fast, use short timeout
         self.mock_position_max_age_minutes = int(os.getenv('MOCK_MAX_POSITION_AGE_MINUTES', '10'))
+        # State file writes happen on one background thread so saves stay ordered
+        self._state_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mock_state")
         
         # Load persisted state if exists
         if self.mock_trading:
@@ -138,13 +322,20 @@ class CopyTrader:
                 "mock_trading_enabled",
                 starting_balance=f"{self.mock_starting_balance:.4f} SOL",
                 current_balance=f"{self.mock_balance:.4f} SOL",
-                open_positions=len([p for p in self.mock_token_positions.values() if p > 0]),
+                open_positions=self._count_mock_positions(),
                 rug_detection="liquidity/mcap based"
             )
         
     async def start(self) -> None:
         """Start the copy trader."""
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
         self.running = True
         
         # Create position manager unless we're in mock mode
@@ -160,15 +351,22 @@ class CopyTrader:
                 trailing_stop_pct=self.config.trailing_stop_pct,
                 rug_abandon_sol=self.config.rug_abandon_sol,
                 mcap_stop_loss_usd=self.config.mcap_stop_loss_usd,
+                session=self.session,
+                on_sell_sent=self._invalidate_balance,
             )
             await self.position_manager.start()
         
+        # Open the Jupiter, DexScreener and RPC connections (DNS + TLS) now rather than on the first trade
+        if not self.mock_trading:
+            self._warm_up_task = asyncio.create_task(self._warm_up_connections())
+        
         # Create wallet monitor
         self.monitor = WalletMonitor(
             rpc_url=self.config.rpc_url,
             target_wallets=self.target_wallets,
             poll_interval_ms=self.config.copy_poll_interval_ms,
-            on_transaction=self._on_transaction
+            on_transaction=self._on_transaction,
+            ws_url=self.config.copy_ws_url
         )
         
         logger.info(
@@ -181,6 +379,10 @@ class CopyTrader:
             stop_loss=f"{self.config.stop_loss_pct}%"
         )
         
+        # Keep trader balances fresh off the copy path
+        if self.copy_proportional:
+            self._trader_balance_task = asyncio.create_task(self._trader_balance_refresher())
+        
         # Start mock position cleanup task if in mock mode (BEFORE monitor blocks)
         if self.mock_trading:
             asyncio.create_task(self._mock_position_cleanup_loop())
@@ -188,6 +390,35 @@ class CopyTrader:
         # Start monitoring (this blocks forever)
         await self.monitor.start()
     
+    async def _warm_up_connections(self) -> None:
+        """Make throwaway Jupiter/DexScreener requests and a balance lookup so the pools are ready for real swaps."""
+        async def warm_jupiter() -> None:
+            try:
+                async with self.session.get(JUPITER_QUOTE_API, params=WARMUP_QUOTE_PARAMS) as resp:
+                    await resp.read()
+                logger.debug("jupiter_connection_warmed", status=resp.status)
+            except Exception as e:
+                logger.debug("jupiter_warmup_failed", error=str(e))
+        
+        async def warm_dexscreener() -> None:
+            # Every non-trusted buy hits DexScreener before anything else
+            try:
+                async with self.session.head(DEXSCREENER_HOST) as resp:
+                    pass
+                logger.debug("dexscreener_connection_warmed", status=resp.status)
+            except Exception as e:
+                logger.debug("dexscreener_warmup_failed", error=str(e))
+        
+        async def warm_rpc() -> None:
+            # Not throwaway - this also seeds the balance cache for the first buy
+            try:
+                await self._get_our_balance()
+                logger.debug("rpc_connection_warmed")
+            except Exception as e:
+                logger.debug("rpc_warmup_failed", error=str(e))
+        
+        await asyncio.gather(warm_jupiter(), warm_dexscreener(), warm_rpc())
+    
     async def _mock_position_cleanup_loop(self) -> None:
         """Periodically clean up stale mock positions to free slots for new trades."""
         logger.info("mock_cleanup_loop_started")
@@ -213,8 +444,8 @@ class CopyTrader:
         logger.debug(
             "mock_health_check",
             active_positions=len(active_mints),
-            min_liquidity=f"${MIN_LIQUIDITY_USD:,.0f}",
-            min_mcap=f"${MIN_MARKET_CAP_USD:,.0f}"
+            min_liquidity_usd=MIN_LIQUIDITY_USD,
+            min_mcap_usd=MIN_MARKET_CAP_USD
         )
         
         for mint in active_mints:
@@ -238,9 +469,9 @@ class CopyTrader:
                     logger.warning(
                         "mock_position_abandoned",
                         token=mint[:8],
-                        entry_sol=f"{entry_sol:.4f}",
-                        market_cap=f"${market_cap:,.0f}",
-                        liquidity=f"${liquidity:,.0f}",
+                        entry_sol=entry_sol,
+                        market_cap=market_cap,
+                        liquidity=liquidity,
                         reason=reason
                     )
                     
@@ -260,6 +491,13 @@ class CopyTrader:
         if self.mock_trading:
             self._save_mock_state()
         
+        for consumer in self._tx_consumers:
+            consumer.cancel()
+        if self._trader_balance_task:
+            self._trader_balance_task.cancel()
+        if self._warm_up_task and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
+        
         if self.position_manager:
             await self.position_manager.stop()
         if self.monitor:
@@ -288,31 +526,39 @@ class CopyTrader:
                 
                 logger.info("mock_state_loaded", 
                     balance=f"{self.mock_balance:.4f}",
-                    positions=len([p for p in self.mock_token_positions.values() if p > 0])
+                    positions=self._count_mock_positions()
                 )
         except Exception as e:
             logger.warning("mock_state_load_error", error=str(e))
     
     def _save_mock_state(self) -> None:
         """Save mock trading state to file for persistence."""
+        # Snapshot now, the dicts keep changing while the writer thread runs
+        state = {
+            'balance': self.mock_balance,
+            'starting_balance': self.mock_starting_balance,
+            'positions': dict(self.mock_token_positions),
+            'entry_times': dict(self.mock_position_entry_time),
+            'entry_sol': dict(self.mock_position_entry_sol),
+            'trades_history': self.mock_trades_history[-100:],  # Keep last 100 trades
+            'last_updated': datetime.now().isoformat(),
+            'pnl': self.mock_balance - self.mock_starting_balance
+        }
+        self._state_writer.submit(self._write_mock_state, state)
+    
+    def _write_mock_state(self, state: Dict) -> None:
+        """Write a mock state snapshot to disk (runs on the writer thread)."""
         try:
-            state = {
-                'balance': self.mock_balance,
-                'starting_balance': self.mock_starting_balance,
-                'positions': self.mock_token_positions,
-                'entry_times': self.mock_position_entry_time,
-                'entry_sol': self.mock_position_entry_sol,
-                'trades_history': self.mock_trades_history[-100:],  # Keep last 100 trades
-                'last_updated': datetime.now().isoformat(),
-                'pnl': self.mock_balance - self.mock_starting_balance
-            }
-            
             with open(self.mock_state_file, 'w') as f:
                 json.dump(state, f, indent=2)
                 
         except Exception as e:
             logger.warning("mock_state_save_error", error=str(e))
     
+    def _count_mock_positions(self) -> int:
+        """Count open mock positions (non-zero token balance)."""
+        return sum(1 for tokens in self.mock_token_positions.values() if tokens > 0)
+    
     def get_dashboard_state(self) -> Dict:
         """Get current state for dashboard display."""
         active_positions = []
@@ -342,39 +588,80 @@ class CopyTrader:
         }
     
     async def _on_transaction(self, tx: WalletTransaction) -> None:
-        """Called when a new transaction is detected from a target wallet."""
+        """Called when a new transaction is detected from a target wallet - queue it."""
+        queue = self._tx_queues.get(tx.wallet)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=TX_QUEUE_MAXSIZE)
+            self._tx_queues[tx.wallet] = queue
+            self._tx_consumers.append(asyncio.create_task(self._consume_transactions(queue)))
+        
+        try:
+            queue.put_nowait(tx)
+        except asyncio.QueueFull:
+            self.stats.total_skipped += 1
+            logger.warning("tx_queue_full", wallet=tx.wallet[:8], signature=tx.signature[:16])
+    
+    async def _consume_transactions(self, queue: asyncio.Queue) -> None:
+        """Process one wallet's detected transactions in order."""
+        while True:
+            tx = await queue.get()
+            try:
+                await self._process_transaction(tx)
+            except Exception as e:
+                logger.error("transaction_processing_error", error=str(e))
+            finally:
+                queue.task_done()
+    
+    async def _process_transaction(self, tx: WalletTransaction) -> None:
+        """Parse a detected transaction and copy it if it passes the checks."""
+        # Cheap duplicate check before the (expensive) parse
+        tx_key = (tx.signature, tx.wallet)
+        if tx_key in self._processed_txs:
+            logger.debug("duplicate_tx_skipped", signature=tx.signature[:16])
+            return
+        self._processed_txs[tx_key] = None
+        if len(self._processed_txs) > PROCESSED_TX_CACHE_SIZE:
+            self._processed_txs.popitem(last=False)
+        
+        # Counted after the dedup so a tx seen by both push and poll counts once
         self.stats.total_detected += 1
         
         # Parse the transaction
         swap = self.parser.parse_transaction(tx.raw_tx, tx.wallet)
         
         if not swap:
-            logger.debug("no_swap_detected", signature=tx.signature[:16])
+            logger.debug("no_swap_detected", signature=tx.signature)
             return
         
-        logger.info(
+        # The mint is a key in several caches for the rest of this trade - intern it once
+        swap.token_mint = sys.intern(swap.token_mint)
+        mint_short = swap.token_mint[:8]
+        # Everything logged about this swap carries the wallet/token labels
+        trade_log = logger.bind(
+            wallet=self._wallet_short.get(tx.wallet) or tx.wallet[:8] + "...",
+            token=mint_short
+        )
+        
+        trade_log.info(
             "swap_detected",
-            wallet=tx.wallet[:8] + "...",
             type=swap.swap_type.value,
-            token=swap.token_mint[:8] + "...",
-            sol=f"{swap.sol_value:.4f}",
+            sol=swap.sol_value,
             dex=swap.dex
         )
         
         # If trader sells a token we hold, copy the sell!
         if swap.is_sell and self.position_manager and self.position_manager.has_position(swap.token_mint):
-            logger.info(
+            trade_log.info(
                 "copying_trader_sell",
-                token=swap.token_mint[:8] + "...",
                 message="Trader sold, we're selling too!"
             )
-            from .position_manager import ExitReason
             result = await self.position_manager.trigger_sell(swap.token_mint, ExitReason.COPIED_SELL)
             if result.success:
+                self._balance_dirty = True
                 self.stats.total_sol_received += result.sol_received
-                logger.info("copied_sell_success", sol_received=f"{result.sol_received:.4f}")
+                trade_log.info("copied_sell_success", sol_received=result.sol_received)
             else:
-                logger.warning("copied_sell_failed", error=result.error)
+                trade_log.warning("copied_sell_failed", error=result.error)
             return
         
         # Decide whether to copy buy
@@ -382,74 +669,91 @@ class CopyTrader:
         
         if not should_copy:
             self.stats.total_skipped += 1
-            logger.info("skip_copy", reason=reason)
+            trade_log.info("skip_copy", reason=reason, sol=swap.sol_value)
             return
         
         # Execute the copy trade (buy)
-        result = await self._execute_copy(swap)
+        result = await self._execute_copy(swap, tx.detected_at)
         
         if result.success:
             self.stats.total_copied += 1
-            logger.info(
+            trade_log.info(
                 "copy_success",
                 signature=result.signature[:16] if result.signature else "none",
-                sol_amount=f"{result.our_sol_amount / 1e9:.4f}"
+                sol_amount=result.our_sol_amount / 1e9
             )
         else:
             self.stats.total_failed += 1
-            logger.warning("copy_failed", error=result.error)
+            trade_log.warning("copy_failed", error=result.error)
     
     def _should_copy(self, swap: ParsedSwap) -> tuple[bool, str]:
         """Determine if we should copy this swap."""
-        
-        # For buys, check position limits (but allow stacking same token)
+        # Buys: cheapest and most selective checks first (dust swaps are the common reject)
         if swap.is_buy:
+            # Check minimum SOL value (only for BUYS - always allow sells)
+            if swap.sol_amount < self._min_trade_lamports:
+                return False, SKIP_BELOW_MIN_SOL
+            
+            token_mint = swap.token_mint
+            
+            # Don't RE-BUY the same token too frequently (but always allow sells)
+            deadline = self.recent_copies.get(token_mint)
+            if deadline is not None:
+                if deadline > time.monotonic():
+                    return False, SKIP_RECENTLY_COPIED
+                # Expired - forget it
+                del self.recent_copies[token_mint]
+            
             # Check sell cooldown - don't buy tokens the trader just sold
             # This prevents us from getting out of sync (buying after they exit)
-            if swap.token_mint in self.trader_sold_cooldown:
-                cooldown_elapsed = time.time() - self.trader_sold_cooldown[swap.token_mint]
-                if cooldown_elapsed < self.sell_cooldown_seconds:
-                    remaining = self.sell_cooldown_seconds - cooldown_elapsed
-                    return False, f"sell_cooldown_active ({remaining:.0f}s remaining)"
-                else:
-                    # Cooldown expired, remove from tracking
-                    del self.trader_sold_cooldown[swap.token_mint]
+            sold_at = self.trader_sold_cooldown.get(token_mint)
+            if sold_at is not None:
+                if time.time() - sold_at < self.sell_cooldown_seconds:
+                    return False, SKIP_SELL_COOLDOWN
+                # Cooldown expired, remove from tracking
+                del self.trader_sold_cooldown[token_mint]
             
             # Check if we can open more positions (only for NEW tokens)
-            if self.position_manager:
-                has_token = self.position_manager.has_position(swap.token_mint)
-                if not has_token and not self.position_manager.can_open_position():
-                    return False, f"max_positions_reached ({self.config.max_positions})"
+            position_manager = self.position_manager
+            if position_manager:
+                if not position_manager.has_position(token_mint) and not position_manager.can_open_position():
+                    return False, self._skip_max_positions
             # Allow stacking - can buy more of same token (removed already_holding_token check)
         
         # For sells, only copy if we hold the token (handled by position manager)
-        if swap.is_sell and not self.copy_sells:
-            return False, "sell_disabled"
-        
-        # Check minimum SOL value (only for BUYS - always allow sells)
-        if swap.is_buy and swap.sol_value < self.min_sol_per_trade:
-            return False, f"below_min_sol ({swap.sol_value:.4f} < {self.min_sol_per_trade})"
-        
-        # Don't RE-BUY the same token too frequently (but always allow sells)
-        if swap.is_buy and swap.token_mint in self.recent_copies:
-            return False, "recently_copied"
+        elif swap.is_sell and not self.copy_sells:
+            return False, SKIP_SELL_DISABLED
         
         return True, "ok"
     
-    async def _execute_copy(self, swap: ParsedSwap) -> CopyTradeResult:
-        """Execute a copy of the detected swap."""
+    async def _execute_copy(self, swap: ParsedSwap, detected_at: Optional[float] = None) -> CopyTradeResult:
+        """Execute a copy of the detected swap (detected_at: monotonic time the tx was seen)."""
+        speculative_quote: Optional[asyncio.Task] = None
+        balance_lookup: Optional[asyncio.Task] = None
+        holder_lookup: Optional[asyncio.Task] = None
+        reserved_slot = False
+        reserved_lamports = 0
+        mint_short = swap.token_mint[:8]
+        
+        # Only one buy per token at a time - two wallets buying the same token
+        # in one poll would otherwise both pass the recent_copies check
+        if swap.is_buy:
+            if swap.token_mint in self._buys_in_flight:
+                return CopyTradeResult(success=False, error="buy_in_flight", original_swap=swap)
+            self._buys_in_flight.add(swap.token_mint)
+        
         try:
             # FAST PATH for sells - skip balance calculations, AGGRESSIVE RETRIES
             if not swap.is_buy:
                 token_balance = await self._get_token_balance(swap.token_mint)
                 if token_balance == 0:
-                    logger.debug("no_tokens_to_sell", token=swap.token_mint[:8])
+                    logger.debug("no_tokens_to_sell", token=mint_short)
                     # Track this sell - don't buy this token for a cooldown period
                     # This prevents us from buying right after trader exits
                     self.trader_sold_cooldown[swap.token_mint] = time.time()
                     logger.info(
                         "sell_cooldown_started",
-                        token=swap.token_mint[:8],
+                        token=mint_short,
                         cooldown_seconds=self.sell_cooldown_seconds,
                         reason="trader_sold_but_we_had_no_position"
                     )
@@ -457,9 +761,9 @@ class CopyTrader:
                 
                 logger.info(
                     "fast_sell",
-                    token=swap.token_mint[:8],
+                    token=mint_short,
                     our_balance=token_balance,
-                    their_sol=f"{swap.sol_value:.4f}"
+                    their_sol=swap.sol_value
                 )
                 
                 # Detect if this is a pump.fun token
@@ -490,33 +794,43 @@ class CopyTrader:
                         )
                     
                     if result.success:
-                        self.stats.total_sol_received += swap.sol_value * 0.01  # Estimate
-                        trade_logger.log_sell(
-                            token_mint=swap.token_mint,
-                            token_symbol=swap.token_symbol,
-                            sol_received=0,
-                            tokens_sold=token_balance,
-                            our_signature=result.signature or "",
-                            trigger="copied_sell",
-                            success=True
-                        )
-                        logger.info("sell_success", token=swap.token_mint[:8], attempt=attempt+1)
+                        self._record_copied_sell(swap, token_balance, result.signature, detected_at)
+                        logger.info("sell_success", token=mint_short, attempt=attempt+1)
                         return result
                     
-                    # Exponential backoff: 0.5s, 1s, 2s, 4s, 8s
-                    delay = 0.5 * (2 ** attempt)
+                    if attempt == max_retries - 1:
+                        break  # No point sleeping after the last attempt
+                    
+                    # Exponential backoff (~0.5s, 1s, 2s, 4s) with jitter so retries
+                    # from several sells don't hit the API in lockstep
+                    delay = SELL_RETRY_BASE_SECONDS * (2 ** attempt) * random.uniform(1 - SELL_RETRY_JITTER, 1 + SELL_RETRY_JITTER)
                     logger.warning(
                         "sell_retry",
-                        token=swap.token_mint[:8],
+                        token=mint_short,
                         attempt=attempt + 1,
                         max_retries=max_retries,
                         next_retry_sec=delay,
                         error=result.error if result else "unknown"
                     )
                     await asyncio.sleep(delay)
+                    
+                    # A send that "failed" can still land (e.g. it timed out after the RPC
+                    # forwarded it) - re-check before selling again so we never double-sell.
+                    # Quote/swap-API failures never sent anything, so skip the RPC call then.
+                    if result.sent:
+                        # At confirmed - the node default (usually finalized) lags a landed sell
+                        # by longer than our backoff windows
+                        remaining = await self._get_token_balance(swap.token_mint, on_error=None, commitment="confirmed")
+                        if remaining == 0:
+                            logger.info("sell_landed_after_error", token=mint_short, attempt=attempt + 1)
+                            self._balance_dirty = True  # Sold for SOL - refetch our balance
+                            self._record_copied_sell(swap, token_balance, None, detected_at)
+                            return CopyTradeResult(success=True, original_swap=swap)
+                        if remaining is not None:
+                            token_balance = remaining
                 
                 # All retries failed - add to retry queue for background retries
-                logger.error("sell_failed_queuing_retry", token=swap.token_mint[:8])
+                logger.error("sell_failed_queuing_retry", token=mint_short)
                 if self.position_manager:
                     self.position_manager.queue_failed_sell(swap.token_mint, token_balance)
                 
@@ -526,12 +840,25 @@ class CopyTrader:
             # For pump.fun tokens, use Pump.fun API instead of DexScreener
             is_pumpfun = swap.dex == "pump.fun"
             
+            # Start the balance and holder lookups now so they run while the token
+            # filters wait on DexScreener. If a filter rejects the buy they're just cancelled.
+            if self._holder_filters and not is_pumpfun:
+                # RugCheck doesn't depend on the DexScreener result - run them side by side
+                holder_lookup = asyncio.create_task(self._get_holder_info(swap.token_mint))
+            
+            if not self.mock_trading:
+                if self.copy_proportional and self._needs_trader_balance(swap.wallet):
+                    # Need the trader's balance too - fetch both in one batched RPC call
+                    balance_lookup = asyncio.create_task(self._get_balance_with_trader(swap.wallet))
+                else:
+                    balance_lookup = asyncio.create_task(self._get_our_balance())
+            
             # TRUST TRADER MODE: Skip all filters for pump.fun tokens
             if is_pumpfun and self.trust_trader_pumpfun:
                 logger.info(
                     "trust_trader_pumpfun",
-                    token=swap.token_mint[:8],
-                    sol=f"{swap.sol_value:.4f}",
+                    token=mint_short,
+                    sol=swap.sol_value,
                     message="Skipping filters - trusting trader for pump.fun token"
                 )
                 # Skip directly to trade execution (no filters)
@@ -551,14 +878,14 @@ class CopyTrader:
                 
                 # If Pump.fun API failed, try DexScreener as fallback
                 if market_cap == 0:
-                    logger.debug("pumpfun_api_failed_trying_dexscreener", token=swap.token_mint[:8])
+                    logger.debug("pumpfun_api_failed_trying_dexscreener", token=mint_short)
                     market_cap, age_minutes, liquidity, volume_24h, price_change_1h, txns_1h = await self._get_token_info(swap.token_mint)
                 
                 # If still no data, skip
                 if market_cap == 0 and age_minutes == 0:
                     logger.info(
                         "skipping_unknown_token",
-                        token=swap.token_mint[:8],
+                        token=mint_short,
                         reason="no_data_available"
                     )
                     return CopyTradeResult(
@@ -569,10 +896,10 @@ class CopyTrader:
                 
                 logger.info(
                     "pumpfun_token_info",
-                    token=swap.token_mint[:8],
-                    market_cap=f"${market_cap:,.0f}",
-                    liquidity=f"${liquidity:,.0f}",
-                    age=f"{age_minutes:.1f}m"
+                    token=mint_short,
+                    market_cap=market_cap,
+                    liquidity=liquidity,
+                    age=age_minutes
                 )
             else:
                 # Use DexScreener for other DEXes
@@ -583,7 +910,7 @@ class CopyTrader:
                     if self.trust_trader_pumpfun:  # Trust trader mode applies to all
                         logger.info(
                             "trust_trader_unknown_token",
-                            token=swap.token_mint[:8],
+                            token=mint_short,
                             message="Token not on DexScreener but trusting trader"
                         )
                         # Set defaults for unknown token
@@ -596,7 +923,7 @@ class CopyTrader:
                     else:
                         logger.info(
                             "skipping_unknown_token",
-                            token=swap.token_mint[:8],
+                            token=mint_short,
                             reason="not_on_dexscreener"
                         )
                         return CopyTradeResult(
@@ -605,259 +932,139 @@ class CopyTrader:
                             original_swap=swap
                         )
             
-            # Skip all filters in trust trader mode
-            skip_filters = self.trust_trader_pumpfun
-            
-            # Check token age
-            if not skip_filters and self.min_token_age_minutes > 0 and age_minutes < self.min_token_age_minutes:
-                logger.info(
-                    "skipping_new_token",
-                    token=swap.token_mint[:8],
-                    age=f"{age_minutes:.1f}m",
-                    min_age=f"{self.min_token_age_minutes}m"
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"token_too_new ({age_minutes:.1f}m < {self.min_token_age_minutes}m)",
-                    original_swap=swap
-                )
-            
-            # Check market cap
-            if not skip_filters and self.min_market_cap_usd > 0 and market_cap < self.min_market_cap_usd:
-                logger.info(
-                    "skipping_low_mcap",
-                    token=swap.token_mint[:8],
-                    market_cap=f"${market_cap:,.0f}",
-                    min_required=f"${self.min_market_cap_usd:,.0f}"
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"market_cap_too_low (${market_cap:,.0f} < ${self.min_market_cap_usd:,.0f})",
-                    original_swap=swap
-                )
-            
-            # Check liquidity - CRITICAL for being able to sell!
-            if not skip_filters and self.min_liquidity_usd > 0 and liquidity < self.min_liquidity_usd:
-                logger.info(
-                    "skipping_low_liquidity",
-                    token=swap.token_mint[:8],
-                    liquidity=f"${liquidity:,.0f}",
-                    min_required=f"${self.min_liquidity_usd:,.0f}"
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"liquidity_too_low (${liquidity:,.0f} < ${self.min_liquidity_usd:,.0f})",
-                    original_swap=swap
-                )
-            
-            # Check 24h volume - indicates trading activity
-            if not skip_filters and self.min_volume_24h_usd > 0 and volume_24h < self.min_volume_24h_usd:
-                logger.info(
-                    "skipping_low_volume",
-                    token=swap.token_mint[:8],
-                    volume_24h=f"${volume_24h:,.0f}",
-                    min_required=f"${self.min_volume_24h_usd:,.0f}"
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"volume_too_low (${volume_24h:,.0f} < ${self.min_volume_24h_usd:,.0f})",
-                    original_swap=swap
-                )
-            
-            # Check if token already pumped too much - avoid buying tops!
-            if not skip_filters and self.max_price_change_1h_pct > 0 and price_change_1h > self.max_price_change_1h_pct:
-                logger.info(
-                    "skipping_already_pumped",
-                    token=swap.token_mint[:8],
-                    price_change_1h=f"+{price_change_1h:.0f}%",
-                    max_allowed=f"+{self.max_price_change_1h_pct:.0f}%"
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"already_pumped (+{price_change_1h:.0f}% > +{self.max_price_change_1h_pct:.0f}%)",
-                    original_swap=swap
-                )
+            # Token filters (empty table in trust trader mode)
+            if self._token_filters:
+                skipped = self._check_buy_filters(self._token_filters, {
+                    "age": age_minutes,
+                    "market_cap": market_cap,
+                    "liquidity": liquidity,
+                    "volume_24h": volume_24h,
+                    "price_change_1h": price_change_1h,
+                    "txns_1h": txns_1h,
+                }, swap, mint_short)
+                if skipped is not None:
+                    return skipped
             
-            # Check minimum transactions - ensure active trading
-            if not skip_filters and self.min_txns_1h > 0 and txns_1h < self.min_txns_1h:
-                logger.info(
-                    "skipping_low_activity",
-                    token=swap.token_mint[:8],
-                    txns_1h=txns_1h,
-                    min_required=self.min_txns_1h
-                )
-                return CopyTradeResult(
-                    success=False,
-                    error=f"low_activity ({txns_1h} txns < {self.min_txns_1h} min)",
-                    original_swap=swap
+            # Token filters passed - start the Jupiter quote so it overlaps the holder check
+            # and balance lookup. Not earlier, or every rejected buy would spend a quote.
+            # Sized from our caps before we know the balance - reused only if close enough.
+            if not self.mock_trading and not is_pumpfun:
+                speculative_lamports = self._max_trade_lamports
+                if not self.copy_proportional:
+                    speculative_lamports = min(speculative_lamports, swap.sol_amount * 2)
+                speculative_lamports = self._round_trade_lamports(speculative_lamports)
+                speculative_quote = asyncio.create_task(
+                    self._get_jupiter_quote(NATIVE_SOL, swap.token_mint, speculative_lamports)
                 )
             
             logger.info(
                 "token_filters_passed",
-                token=swap.token_mint[:8],
-                market_cap=f"${market_cap:,.0f}",
-                liquidity=f"${liquidity:,.0f}",
-                volume_24h=f"${volume_24h:,.0f}",
-                price_change_1h=f"{price_change_1h:+.0f}%",
+                token=mint_short,
+                market_cap=market_cap,
+                liquidity=liquidity,
+                volume_24h=volume_24h,
+                price_change_1h=price_change_1h,
                 txns_1h=txns_1h,
-                age=f"{age_minutes:.1f}m"
+                age=age_minutes
             )
             
             # BUYS: Check holder distribution filters (using RugCheck API)
             # Skip for pump.fun tokens - they're too new for RugCheck data
-            if not is_pumpfun and (self.max_top10_holders_pct > 0 or self.max_dev_holdings_pct > 0 or self.min_holders_count > 0):
-                top10_pct, dev_pct, holders_count = await self._get_holder_info(swap.token_mint)
+            if holder_lookup is not None:
+                top10_pct, dev_pct, holders_count = await holder_lookup
                 
                 # Only apply filters if we got data (0 means API failed/no data)
                 if top10_pct > 0 or holders_count > 0:
-                    # Check top 10 holders concentration
-                    if self.max_top10_holders_pct > 0 and top10_pct > self.max_top10_holders_pct:
-                        logger.info(
-                            "skipping_concentrated_holdings",
-                            token=swap.token_mint[:8],
-                            top10_pct=f"{top10_pct:.1f}%",
-                            max_allowed=f"{self.max_top10_holders_pct:.0f}%"
-                        )
-                        return CopyTradeResult(
-                            success=False,
-                            error=f"top10_holders_too_high ({top10_pct:.1f}% > {self.max_top10_holders_pct:.0f}%)",
-                            original_swap=swap
-                        )
-                    
-                    # Check dev holdings
-                    if self.max_dev_holdings_pct > 0 and dev_pct > self.max_dev_holdings_pct:
-                        logger.info(
-                            "skipping_high_dev_holdings",
-                            token=swap.token_mint[:8],
-                            dev_pct=f"{dev_pct:.1f}%",
-                            max_allowed=f"{self.max_dev_holdings_pct:.0f}%"
-                        )
-                        return CopyTradeResult(
-                            success=False,
-                            error=f"dev_holdings_too_high ({dev_pct:.1f}% > {self.max_dev_holdings_pct:.0f}%)",
-                            original_swap=swap
-                        )
-                    
-                    # Check minimum holders count
-                    if self.min_holders_count > 0 and holders_count < self.min_holders_count:
-                        logger.info(
-                            "skipping_low_holders",
-                            token=swap.token_mint[:8],
-                            holders=holders_count,
-                            min_required=self.min_holders_count
-                        )
-                        return CopyTradeResult(
-                            success=False,
-                            error=f"too_few_holders ({holders_count} < {self.min_holders_count})",
-                            original_swap=swap
-                        )
+                    skipped = self._check_buy_filters(self._holder_filters, {
+                        "top10_pct": top10_pct,
+                        "dev_pct": dev_pct,
+                        "holders": holders_count,
+                    }, swap, mint_short)
+                    if skipped is not None:
+                        return skipped
                     
                     logger.info(
                         "holder_filters_passed",
-                        token=swap.token_mint[:8],
-                        top10_pct=f"{top10_pct:.1f}%",
-                        dev_pct=f"{dev_pct:.1f}%",
+                        token=mint_short,
+                        top10_pct=top10_pct,
+                        dev_pct=dev_pct,
                         holders=holders_count
                     )
             
-            # BUYS: Full calculation path
+            # BUYS: Full calculation path (integer lamports throughout)
             if self.mock_trading:
-                balance_sol = self.mock_balance
+                balance = int(self.mock_balance * LAMPORTS_PER_SOL)
             else:
-                balance = await self.rpc.get_balance(self.wallet.pubkey())
-                balance_sol = balance / 1e9
+                balance = await balance_lookup
             
             # Calculate fee reserve needed for existing + new positions
             if self.mock_trading:
-                current_positions = len([p for p in self.mock_token_positions.values() if p > 0])
+                current_positions = self._count_mock_positions()
             else:
                 current_positions = len(self.position_manager.positions) if self.position_manager else 0
             
-            # Check max positions limit
-            if current_positions >= self.max_positions:
+            # Check max positions limit - buys from other wallets that are still in
+            # flight count too, or several could pass the cap at once
+            if current_positions + self._reserved_positions >= self.max_positions:
                 return CopyTradeResult(
                     success=False,
-                    error=f"max_positions_reached ({current_positions}/{self.max_positions})",
+                    error=f"max_positions_reached ({current_positions + self._reserved_positions}/{self.max_positions})",
                     original_swap=swap
                 )
+            self._reserved_positions += 1
+            reserved_slot = True
             
-            total_fee_reserve = self.fee_reserve + (self.exit_fee_reserve * (current_positions + 1))
+            # Exit fees for open positions plus every buy in flight (this one included)
+            total_fee_reserve = self._fee_reserve_lamports + self._exit_fee_reserve_lamports * (current_positions + self._reserved_positions)
             
-            # Available balance after fee reserve
-            available_sol = max(0, balance_sol - total_fee_reserve)
+            # Available balance after fee reserve and what other in-flight buys hold
+            available = max(0, balance - total_fee_reserve - self._reserved_lamports)
             
             logger.debug(
                 "balance_calculation",
-                balance=f"{balance_sol:.4f}",
+                balance_lamports=balance,
                 positions=current_positions,
-                fee_reserve=f"{total_fee_reserve:.4f}",
-                available=f"{available_sol:.4f}"
+                fee_reserve_lamports=total_fee_reserve,
+                available_lamports=available
             )
             
-            # Calculate trade size
-            if self.copy_proportional:
-                # Proportional: match their percentage
-                # Get trader's balance (cache it to avoid too many RPC calls)
-                if swap.wallet not in self.trader_balances:
-                    try:
-                        from solders.pubkey import Pubkey
-                        trader_balance = await self.rpc.get_balance(Pubkey.from_string(swap.wallet))
-                        self.trader_balances[swap.wallet] = trader_balance / 1e9
-                    except:
-                        self.trader_balances[swap.wallet] = 10.0  # Default assumption
-                
-                trader_total = self.trader_balances[swap.wallet]
-                their_percentage = swap.sol_value / trader_total if trader_total > 0 else 0.1
-                
-                # Apply their percentage to our available balance
-                # BUT ensure minimum floor (at least enough to meet min_sol or 15% of available)
-                min_percentage = max(self.min_sol_per_trade / available_sol, 0.15) if available_sol > 0 else 0.15
-                effective_percentage = max(their_percentage, min_percentage)
-                
-                trade_sol = min(
-                    available_sol * effective_percentage,  # Match their % (with floor)
-                    available_sol * 0.5,                   # Never more than 50% on one trade
-                    self.max_sol_per_trade                 # Hard cap
-                )
-                
-                logger.info(
-                    "proportional_sizing",
-                    their_pct=f"{their_percentage*100:.1f}%",
-                    effective_pct=f"{effective_percentage*100:.1f}%",
-                    their_sol=f"{swap.sol_value:.4f}",
-                    our_sol=f"{trade_sol:.4f}",
-                    our_available=f"{available_sol:.4f}"
-                )
-            else:
-                # Fixed: use configured percentage
-                trade_sol = min(
-                    available_sol * self.copy_percentage,
-                    self.max_sol_per_trade,
-                    swap.sol_value * 2
-                )
+            # Calculate trade size (proportional or fixed, picked in __init__)
+            trade_lamports = await self._size_trade(available, swap)
+            
+            # Round to 0.0001 SOL steps (0.04999 -> 0.05)
+            trade_lamports = self._round_trade_lamports(trade_lamports)
             
-            # Round to avoid floating point precision issues (0.04999 -> 0.05)
-            trade_sol = round(trade_sol, 4)
+            # Other buys may have landed or reserved while we sized - re-check against
+            # what's left now (nothing awaits from here until the reservation is taken)
+            balance = self._latest_balance(balance)
+            total_fee_reserve = self._fee_reserve_lamports + self._exit_fee_reserve_lamports * (current_positions + self._reserved_positions)
+            available = max(0, balance - total_fee_reserve - self._reserved_lamports)
+            trade_lamports = min(trade_lamports, available)
             
             # Ensure minimum trade size if we have enough balance
-            if trade_sol < self.min_sol_per_trade:
-                if available_sol >= self.min_sol_per_trade:
-                    trade_sol = self.min_sol_per_trade  # Bump up to minimum
+            if trade_lamports < self._min_trade_lamports:
+                if available >= self._min_trade_lamports:
+                    trade_lamports = self._min_trade_lamports  # Bump up to minimum
                 else:
                     return CopyTradeResult(
                         success=False,
-                        error=f"insufficient_balance ({available_sol:.4f} SOL < {self.min_sol_per_trade} min)",
+                        error=f"insufficient_balance ({available / 1e9:.4f} SOL < {self.min_sol_per_trade} min)",
                         original_swap=swap
                     )
             
-            trade_lamports = int(trade_sol * 1e9)
+            trade_sol = trade_lamports / 1e9
+            
+            # Hold these lamports until the buy finishes - on success they've been
+            # debited from the cached balance by then
+            reserved_lamports = trade_lamports + BUY_COST_OVERHEAD_LAMPORTS
+            self._reserved_lamports += reserved_lamports
             
             logger.info(
                 "executing_copy",
                 type=swap.swap_type.value,
-                token=swap.token_mint[:8] + "...",
-                our_sol=f"{trade_sol:.4f}",
-                their_sol=f"{swap.sol_value:.4f}",
+                token=mint_short + "...",
+                our_sol=trade_sol,
+                their_sol=swap.sol_value,
                 dex=swap.dex
             )
             
@@ -876,55 +1083,71 @@ class CopyTrader:
                 if self.mock_trading:
                     result = self._simulate_mock_buy(swap, trade_sol)
                 else:
+                    # Reuse the speculative quote if it's for (almost) the amount we settled on
+                    # and the filters didn't take so long that it went stale
+                    quote = None
+                    if speculative_quote is not None:
+                        spec_quote, _ = await speculative_quote
+                        if (
+                            spec_quote
+                            and trade_lamports * SPECULATIVE_QUOTE_MIN_FILL <= speculative_lamports <= trade_lamports
+                            and self._quote_is_fresh((NATIVE_SOL, swap.token_mint, speculative_lamports), spec_quote)
+                        ):
+                            quote = spec_quote
+                            trade_lamports = speculative_lamports
+                            trade_sol = trade_lamports / 1e9
+                    
                     # Use Jupiter for Raydium/other DEXes
                     result = await self._execute_swap(
                         input_mint=NATIVE_SOL,
                         output_mint=swap.token_mint,
-                        amount=trade_lamports
+                        amount=trade_lamports,
+                        quote=quote
                     )
             
             if result.success:
-                # For BUYS: Track to avoid rapid re-buying (30 sec cooldown)
-                # For SELLS: Don't track - allow multiple sell attempts
-                if swap.is_buy:
-                    self.recent_copies.add(swap.token_mint)
-                    asyncio.create_task(self._clear_recent_copy(swap.token_mint, 30))
+                # Sells returned from the fast path above, so this is always a buy.
+                # Track it to avoid rapid re-buying (30 sec cooldown)
+                now = time.monotonic()
+                self._prune_recent_copies(now)
+                self.recent_copies[swap.token_mint] = now + RECENT_COPY_TTL_SECONDS
                 
-                if swap.is_buy:
-                    self.stats.total_sol_spent += trade_sol
-                    
-                    # Estimate tokens received from the swap
-                    # In reality, we'd parse this from the transaction result
-                    estimated_tokens = int(trade_lamports * 1000)  # Placeholder
-                    
-                    # Register position for auto-sell management
-                    if self.position_manager:
-                        self.position_manager.add_position(
-                            token_mint=swap.token_mint,
-                            token_symbol=swap.token_symbol,
-                            our_sol=trade_sol,
-                            our_tokens=estimated_tokens,
-                            our_signature=result.signature,
-                            copied_from=swap.wallet,
-                            dex="pump.fun" if is_pumpfun else swap.dex
-                        )
-                    
-                    # Log the trade for analysis
-                    trade_logger.log_buy(
+                self.stats.total_sol_spent += trade_sol
+                if not self.mock_trading:
+                    self._debit_balance(trade_lamports)
+                
+                # Estimate tokens received from the swap
+                # In reality, we'd parse this from the transaction result
+                estimated_tokens = int(trade_lamports * 1000)  # Placeholder
+                
+                # Register position for auto-sell management
+                if self.position_manager:
+                    self.position_manager.add_position(
                         token_mint=swap.token_mint,
                         token_symbol=swap.token_symbol,
-                        our_sol=trade_sol,
-                        our_tokens=estimated_tokens,
-                        our_signature=result.signature,
-                        copied_wallet=swap.wallet,
-                        their_sol=swap.sol_value,
-                        their_signature=swap.signature,
-                        their_timestamp=None,
-                        delay_seconds=(datetime.utcnow() - datetime.utcnow()).total_seconds(),  # TODO: track actual delay
-                        success=True
+                        entry_sol=trade_sol,
+                        token_amount=estimated_tokens,
+                        entry_signature=result.signature,
+                        copied_from=swap.wallet,
+                        dex="pump.fun" if is_pumpfun else swap.dex
                     )
-                else:
-                    self.stats.total_sol_received += trade_sol
+                
+                # Log the trade for analysis (after we've returned - add_position above
+                # stays inline so the position manager sees the buy immediately)
+                asyncio.get_running_loop().call_soon(partial(
+                    trade_logger.log_buy,
+                    token_mint=swap.token_mint,
+                    token_symbol=swap.token_symbol,
+                    our_sol=trade_sol,
+                    our_tokens=estimated_tokens,
+                    our_signature=result.signature,
+                    copied_wallet=swap.wallet,
+                    their_sol=swap.sol_value,
+                    their_signature=swap.signature,
+                    their_timestamp=None,
+                    delay_seconds=time.monotonic() - detected_at if detected_at is not None else 0.0,
+                    success=True
+                ))
             
             result.original_swap = swap
             result.our_sol_amount = trade_lamports
@@ -936,66 +1159,367 @@ class CopyTrader:
                 error=str(e),
                 original_swap=swap
             )
+        finally:
+            if swap.is_buy:
+                self._buys_in_flight.discard(swap.token_mint)
+            if reserved_slot:
+                # Landed buys were added as positions above, so the slot is accounted for
+                self._reserved_positions -= 1
+            self._reserved_lamports -= reserved_lamports
+            # Trade was gated before the lookups got used
+            if speculative_quote is not None and not speculative_quote.done():
+                speculative_quote.cancel()
+            if holder_lookup is not None and not holder_lookup.done():
+                holder_lookup.cancel()
+            if balance_lookup is not None:
+                if not balance_lookup.done():
+                    balance_lookup.cancel()
+                elif not balance_lookup.cancelled():
+                    balance_lookup.exception()  # Mark an unused failed lookup as retrieved
+    
+    def _record_copied_sell(
+        self,
+        swap: ParsedSwap,
+        tokens_sold: int,
+        signature: Optional[str],
+        detected_at: Optional[float]
+    ) -> None:
+        """Stats and trade history for a copied sell that landed."""
+        self.stats.total_sol_received += swap.sol_value * 0.01  # Estimate
+        position = self.position_manager.get_position(swap.token_mint) if self.position_manager else None
+        # History record is bookkeeping - build and write it after we've returned
+        asyncio.get_running_loop().call_soon(partial(
+            trade_logger.log_sell,
+            token_mint=swap.token_mint,
+            token_symbol=swap.token_symbol,
+            our_sol_received=0,  # Not parsed from the tx yet
+            our_tokens_sold=tokens_sold,
+            our_signature=signature or "",
+            copied_wallet=swap.wallet,
+            their_sol=swap.sol_value,
+            their_signature=swap.signature,
+            delay_seconds=time.monotonic() - detected_at if detected_at is not None else 0.0,
+            entry_sol=position.entry_sol if position else 0,
+            exit_reason="copied_sell",
+            success=True
+        ))
+    
+    def _check_buy_filters(
+        self,
+        filters: List[tuple],
+        metrics: Dict[str, float],
+        swap: ParsedSwap,
+        mint_short: str
+    ) -> Optional[CopyTradeResult]:
+        """Run a filter table from __init__; returns the skip result for the first failing filter."""
+        for metric, limit, is_max, event, limit_field, error_fmt in filters:
+            value = metrics[metric]
+            if (value > limit) if is_max else (value < limit):
+                logger.info(event, token=mint_short, **{metric: value, limit_field: limit})
+                return CopyTradeResult(
+                    success=False,
+                    error=error_fmt.format(value=value, limit=limit),
+                    original_swap=swap
+                )
+        return None
+    
+    async def _size_trade_proportional(self, available: int, swap: ParsedSwap) -> int:
+        """Proportional: match the trader's percentage of their balance (lamports)."""
+        # Get trader's balance (cached, refreshed in the background)
+        trader_total = await self._get_trader_balance(swap.wallet)
+        their_percentage = swap.sol_value / trader_total if trader_total > 0 else 0.1
+        
+        # Apply their percentage to our available balance
+        # BUT ensure minimum floor (at least enough to meet min_sol or 15% of available)
+        min_percentage = max(self._min_trade_lamports / available, 0.15) if available > 0 else 0.15
+        effective_percentage = max(their_percentage, min_percentage)
+        
+        trade_lamports = min(
+            int(available * effective_percentage),  # Match their % (with floor)
+            available // 2,                         # Never more than 50% on one trade
+            self._max_trade_lamports                # Hard cap
+        )
+        
+        logger.info(
+            "proportional_sizing",
+            their_pct=their_percentage * 100,
+            effective_pct=effective_percentage * 100,
+            their_lamports=swap.sol_amount,
+            our_lamports=trade_lamports,
+            our_available_lamports=available
+        )
+        return trade_lamports
+    
+    async def _size_trade_fixed(self, available: int, swap: ParsedSwap) -> int:
+        """Fixed: use the configured percentage of our available balance (lamports)."""
+        return min(
+            available * self._copy_pct_num // self._copy_pct_den,
+            self._max_trade_lamports,
+            swap.sol_amount * 2
+        )
+    
+    @staticmethod
+    def _round_trade_lamports(lamports: int) -> int:
+        """Round a trade size to the nearest 0.0001 SOL step."""
+        return (lamports + TRADE_SIZE_STEP_LAMPORTS // 2) // TRADE_SIZE_STEP_LAMPORTS * TRADE_SIZE_STEP_LAMPORTS
+    
+    def _latest_balance(self, balance: int) -> int:
+        """Our balance for sizing, lowered to the cache if a buy was debited since we read it."""
+        if self.mock_trading:
+            return int(self.mock_balance * LAMPORTS_PER_SOL)
+        cached = self._cached_balance()
+        return min(balance, cached) if cached is not None else balance
+    
+    def _cached_balance(self) -> Optional[int]:
+        """Return our cached balance (lamports) if it's still fresh, else None."""
+        if self._balance_dirty or self._balance_cache is None:
+            return None
+        balance, fetched_at = self._balance_cache
+        if time.monotonic() - fetched_at >= self.balance_cache_seconds:
+            return None
+        return balance
+    
+    def _store_balance(self, balance: int) -> None:
+        """Remember a freshly fetched balance."""
+        self._balance_cache = (balance, time.monotonic())
+        self._balance_dirty = False
+    
+    def _invalidate_balance(self) -> None:
+        """Our SOL balance changed by an unknown amount (e.g. a sell) - refetch it next time."""
+        self._balance_dirty = True
+    
+    def _debit_balance(self, trade_lamports: int) -> None:
+        """Take a buy we just sent off the cached balance instead of refetching it.
+        
+        The entry keeps its original fetch time, so it's still resynced from the
+        RPC once balance_cache_seconds runs out.
+        """
+        if self._balance_cache is None:
+            self._balance_dirty = True
+            return
+        balance, fetched_at = self._balance_cache
+        self._balance_cache = (max(0, balance - trade_lamports - BUY_COST_OVERHEAD_LAMPORTS), fetched_at)
+    
+    async def _get_our_balance(self) -> int:
+        """Get our SOL balance in lamports, from cache when nothing has changed."""
+        balance = self._cached_balance()
+        if balance is None:
+            balance = await self.rpc.get_balance(self._wallet_pubkey)
+            self._store_balance(balance)
+        return balance
+    
+    async def _get_balance_with_trader(self, trader_wallet: str) -> int:
+        """Get our balance (lamports) and cache the trader's balance in one batch request."""
+        trader_pubkey = self._trader_pubkeys[trader_wallet]
+        
+        balance = self._cached_balance()
+        if balance is not None:
+            # Ours is fresh - only the trader's balance needs a round trip
+            try:
+                trader_balance = await self.rpc.get_balance(trader_pubkey)
+            except Exception:
+                trader_balance = None
+        else:
+            balance, trader_balance = await self.rpc.get_balances([self._wallet_pubkey, trader_pubkey])
+            if balance is None:
+                # Our own balance is required for sizing - retry on its own
+                balance = await self.rpc.get_balance(self._wallet_pubkey)
+            self._store_balance(balance)
+        
+        self._store_trader_balance(trader_wallet, trader_balance)
+        return balance
+    
+    def _store_trader_balance(self, trader_wallet: str, lamports: Optional[int]) -> None:
+        """Cache a trader's balance (None = lookup failed, use the default)."""
+        sol = lamports / 1e9 if lamports is not None else TRADER_BALANCE_DEFAULT_SOL
+        self._trader_balance_cache[trader_wallet] = (sol, time.monotonic() + TRADER_BALANCE_TTL_SECONDS)
+    
+    def _needs_trader_balance(self, trader_wallet: str) -> bool:
+        """Whether to fetch the trader's balance along with ours.
+        
+        Always for a trader we haven't seen. A stale one only rides along when
+        our own balance needs a round trip anyway - otherwise it's refreshed
+        in the background.
+        """
+        cached = self._trader_balance_cache.get(trader_wallet)
+        if cached is None:
+            return True
+        return cached[1] <= time.monotonic() and self._cached_balance() is None
+    
+    async def _get_trader_balance(self, trader_wallet: str) -> float:
+        """Get a trader's SOL balance, only waiting on the RPC the first time we see them."""
+        cached = self._trader_balance_cache.get(trader_wallet)
+        if cached is None:
+            await self._refresh_trader_balance(trader_wallet)
+            return self._trader_balance_cache[trader_wallet][0]
+        
+        sol, expires_at = cached
+        if expires_at <= time.monotonic() and trader_wallet not in self._trader_balance_refreshes:
+            # Stale - size this trade with it anyway and refresh for the next one
+            task = asyncio.create_task(self._refresh_trader_balance(trader_wallet))
+            self._trader_balance_refreshes[trader_wallet] = task
+            task.add_done_callback(lambda _: self._trader_balance_refreshes.pop(trader_wallet, None))
+        return sol
+    
+    async def _refresh_trader_balance(self, trader_wallet: str) -> None:
+        """Fetch one trader's balance into the cache."""
+        try:
+            lamports = await self.rpc.get_balance(self._trader_pubkeys[trader_wallet])
+        except Exception as e:
+            logger.debug("trader_balance_failed", wallet=trader_wallet[:8], error=str(e))
+            lamports = None
+        self._store_trader_balance(trader_wallet, lamports)
+    
+    async def _trader_balance_refresher(self) -> None:
+        """Re-fetch cached trader balances that are about to expire, in one batch request."""
+        while self.running:
+            await asyncio.sleep(TRADER_BALANCE_REFRESH_SECONDS)
+            refresh_before = time.monotonic() + TRADER_BALANCE_REFRESH_SECONDS
+            wallets = [
+                w for w, (_, expires_at) in self._trader_balance_cache.items()
+                if expires_at <= refresh_before
+            ]
+            if not wallets:
+                continue
+            try:
+                balances = await self.rpc.get_balances([self._trader_pubkeys[w] for w in wallets])
+            except Exception as e:
+                logger.debug("trader_balance_refresh_failed", error=str(e))
+                continue
+            for wallet, lamports in zip(wallets, balances):
+                if lamports is not None:
+                    self._store_trader_balance(wallet, lamports)
+    
+    async def _sign_and_send(self, tx_bytes: bytes) -> str:
+        """Sign a serialized transaction from the swap API with our wallet and send it."""
+        tx = VersionedTransaction.from_bytes(tx_bytes)
+        signed_tx = VersionedTransaction(tx.message, self._signers)
+        return await self.rpc.send_transaction(signed_tx)
+    
+    async def _get_jupiter_quote(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int
+    ) -> tuple[Optional[Dict], Optional[str]]:
+        """Get a Jupiter quote. Returns (quote, None) or (None, error)."""
+        # Same trade size for the same pair a moment ago - reuse that quote
+        cache_key = (input_mint, output_mint, amount)
+        cached = self._quote_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < QUOTE_CACHE_TTL_SECONDS:
+            return cached[1], None
+        
+        # Someone is already fetching this exact quote - wait for theirs
+        fetch = self._inflight_quotes.get(cache_key)
+        if fetch is None:
+            fetch = asyncio.create_task(self._fetch_jupiter_quote(cache_key))
+            self._inflight_quotes[cache_key] = fetch
+            fetch.add_done_callback(lambda _: self._inflight_quotes.pop(cache_key, None))
+        
+        # Shielded so a cancelled caller (e.g. an unused speculative quote) doesn't
+        # cancel the request for everyone else waiting on it
+        return await asyncio.shield(fetch)
+    
+    async def _fetch_jupiter_quote(
+        self,
+        cache_key: tuple[str, str, int]
+    ) -> tuple[Optional[Dict], Optional[str]]:
+        """Request a quote from Jupiter and cache it on success."""
+        input_mint, output_mint, amount = cache_key
+        
+        # Everything but the amount is fixed per pair - build that part of the URL once
+        # (mints are base58, nothing to escape)
+        pair = (input_mint, output_mint)
+        url_prefix = self._quote_url_prefixes.get(pair)
+        if url_prefix is None:
+            if len(self._quote_url_prefixes) >= TOKEN_CACHE_MAX_SIZE:
+                self._quote_url_prefixes.clear()
+            url_prefix = (
+                f"{JUPITER_QUOTE_API}?inputMint={input_mint}&outputMint={output_mint}"
+                f"&slippageBps={self._slippage_bps_str}&amount="
+            )
+            self._quote_url_prefixes[pair] = url_prefix
+        
+        try:
+            async with self.session.get(url_prefix + str(amount)) as resp:
+                if resp.status != 200:
+                    error_text = await resp.text()
+                    return None, f"quote_failed: {error_text}"
+                quote = orjson.loads(await resp.read())
+        except Exception as e:
+            return None, f"quote_failed: {e}"
+        
+        self._store_quote(cache_key, quote)
+        return quote, None
+    
+    def _store_quote(self, cache_key: tuple[str, str, int], quote: Dict) -> None:
+        """Cache a fresh quote, dropping expired ones once the cache gets big."""
+        now = time.monotonic()
+        if len(self._quote_cache) >= QUOTE_CACHE_MAX_SIZE:
+            self._quote_cache = {
+                key: entry for key, entry in self._quote_cache.items()
+                if now - entry[0] < QUOTE_CACHE_TTL_SECONDS
+            }
+        self._quote_cache[cache_key] = (now, quote)
+    
+    def _quote_is_fresh(self, cache_key: tuple[str, str, int], quote: Dict) -> bool:
+        """Whether this quote is still the cached one for its key and within the TTL."""
+        cached = self._quote_cache.get(cache_key)
+        return cached is not None and cached[1] is quote and time.monotonic() - cached[0] < QUOTE_CACHE_TTL_SECONDS
     
     async def _execute_swap(
         self, 
         input_mint: str, 
         output_mint: str, 
-        amount: int
+        amount: int,
+        quote: Optional[Dict] = None
     ) -> CopyTradeResult:
-        """Execute a swap via Jupiter."""
+        """Execute a swap via Jupiter (using the given quote if we already have one)."""
+        sending = False
         try:
             # Get quote
-            quote_params = {
-                "inputMint": input_mint,
-                "outputMint": output_mint,
-                "amount": str(amount),
-                "slippageBps": str(self.config.slippage_bps)
-            }
-            
-            async with self.session.get(JUPITER_QUOTE_API, params=quote_params) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    return CopyTradeResult(success=False, error=f"quote_failed: {error_text}")
-                quote = await resp.json()
+            if quote is None:
+                quote, error = await self._get_jupiter_quote(input_mint, output_mint, amount)
+                if quote is None:
+                    return CopyTradeResult(success=False, error=error)
             
             # Get swap transaction with HIGH priority fees for fast execution
-            swap_data = {
-                "quoteResponse": quote,
-                "userPublicKey": str(self.wallet.pubkey()),
-                "wrapAndUnwrapSol": True,
-                "dynamicComputeUnitLimit": True,
-                "prioritizationFeeLamports": 500000  # Very high priority ~0.0005 SOL for fastest execution
-            }
+            # Only the quote gets encoded per swap, the rest of the body is prebuilt
+            swap_body = self._swap_body_prefix + orjson.dumps(quote) + b"}"
             
-            async with self.session.post(JUPITER_SWAP_API, json=swap_data) as resp:
+            async with self.session.post(JUPITER_SWAP_API, data=swap_body, headers=JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
-                    return CopyTradeResult(success=False, error=f"swap_failed: {error_text}")
-                swap_response = await resp.json()
+                    return self._swap_failed(input_mint, output_mint, amount, f"swap_failed: {error_text}")
+                swap_response = orjson.loads(await resp.read())
             
             # Sign and send transaction
             swap_tx_base64 = swap_response.get("swapTransaction")
             if not swap_tx_base64:
-                return CopyTradeResult(success=False, error="no_swap_transaction")
+                return self._swap_failed(input_mint, output_mint, amount, "no_swap_transaction")
             
             # Decode, sign, and send
-            import base64
-            from solders.transaction import VersionedTransaction
-            
-            tx_bytes = base64.b64decode(swap_tx_base64)
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            
-            # Sign the transaction
-            signed_tx = VersionedTransaction(tx.message, [self.wallet])
-            
-            # Send
-            signature = await self.rpc.send_transaction(signed_tx)
+            sending = True
+            signature = await self._sign_and_send(base64.b64decode(swap_tx_base64))
             
+            if input_mint != NATIVE_SOL:
+                self._balance_dirty = True  # Sold for SOL - amount unknown until we refetch (buys are debited by the caller)
             return CopyTradeResult(success=True, signature=signature)
             
         except Exception as e:
-            return CopyTradeResult(success=False, error=str(e))
+            return self._swap_failed(input_mint, output_mint, amount, str(e), sent=sending)
+    
+    def _swap_failed(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        error: str,
+        sent: bool = False
+    ) -> CopyTradeResult:
+        """Failed Jupiter swap - drop its cached quote so a retry requotes instead of resubmitting it."""
+        self._quote_cache.pop((input_mint, output_mint, amount), None)
+        return CopyTradeResult(success=False, error=error, sent=sent)
     
     async def _execute_pumpfun_swap(
         self,
@@ -1005,10 +1529,8 @@ class CopyTrader:
         sell_percentage: int = 100  # For sells: percentage of holdings to sell (100 = all)
     ) -> CopyTradeResult:
         """Execute a swap on Pump.fun's bonding curve."""
+        sending = False
         try:
-            import base64
-            from solders.transaction import VersionedTransaction
-            
             action = "buy" if is_buy else "sell"
             
             # Request transaction from PumpPortal
@@ -1017,7 +1539,7 @@ class CopyTrader:
             
             if is_buy:
                 payload = {
-                    "publicKey": str(self.wallet.pubkey()),
+                    "publicKey": self._wallet_pubkey_str,
                     "action": action,
                     "mint": token_mint,
                     "denominatedInSol": "true",
@@ -1029,7 +1551,7 @@ class CopyTrader:
             else:
                 # For sells, use percentage of holdings
                 payload = {
-                    "publicKey": str(self.wallet.pubkey()),
+                    "publicKey": self._wallet_pubkey_str,
                     "action": action,
                     "mint": token_mint,
                     "denominatedInSol": "false",
@@ -1043,10 +1565,10 @@ class CopyTrader:
                 "pumpfun_swap_request",
                 action=action,
                 token=token_mint[:8],
-                sol=f"{sol_amount:.4f}"
+                sol=sol_amount
             )
             
-            async with self.session.post(PUMPFUN_API, json=payload) as resp:
+            async with self.session.post(PUMPFUN_API, data=orjson.dumps(payload), headers=JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     return CopyTradeResult(success=False, error=f"pumpfun_api_failed: {error_text}")
@@ -1054,12 +1576,9 @@ class CopyTrader:
                 # Response is the raw transaction bytes
                 tx_bytes = await resp.read()
             
-            # Deserialize and sign the transaction
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [self.wallet])
-            
-            # Send the transaction
-            signature = await self.rpc.send_transaction(signed_tx)
+            # Sign with our wallet and send
+            sending = True
+            signature = await self._sign_and_send(tx_bytes)
             
             logger.info(
                 "pumpfun_swap_success",
@@ -1068,11 +1587,13 @@ class CopyTrader:
                 signature=str(signature)[:16] if signature else None
             )
             
+            if not is_buy:
+                self._balance_dirty = True  # Sold for SOL - amount unknown until we refetch (buys are debited by the caller)
             return CopyTradeResult(success=True, signature=signature)
             
         except Exception as e:
             logger.error("pumpfun_swap_error", error=str(e))
-            return CopyTradeResult(success=False, error=f"pumpfun_error: {str(e)}")
+            return CopyTradeResult(success=False, error=f"pumpfun_error: {str(e)}", sent=sending)
     
     def _simulate_mock_buy(self, swap: 'ParsedSwap', trade_sol: float) -> 'CopyTradeResult':
         """Simulate a buy trade without executing on-chain."""
@@ -1102,9 +1623,9 @@ class CopyTrader:
         logger.info(
             "mock_buy",
             token=swap.token_mint[:8],
-            sol_spent=f"{trade_sol:.4f}",
+            sol_spent=trade_sol,
             tokens_received=estimated_tokens,
-            new_balance=f"{self.mock_balance:.4f}",
+            new_balance=self.mock_balance,
             total_tokens=self.mock_token_positions[swap.token_mint]
         )
         
@@ -1153,10 +1674,10 @@ class CopyTrader:
             "mock_sell",
             token=swap.token_mint[:8],
             tokens_sold=token_balance,
-            sol_received=f"{sol_received:.4f}",
-            entry_sol=f"{entry_sol:.4f}",
-            pnl=f"{pnl:+.4f}",
-            new_balance=f"{self.mock_balance:.4f}"
+            sol_received=sol_received,
+            entry_sol=entry_sol,
+            pnl=pnl,
+            new_balance=self.mock_balance
         )
         
         # Track trade in history
@@ -1181,52 +1702,50 @@ class CopyTrader:
             mock=True
         )
     
-    async def _get_token_balance(self, mint: str) -> int:
-        """Get token balance for our wallet by finding the associated token account."""
+    async def _get_token_balance(
+        self,
+        mint: str,
+        on_error: Optional[int] = 0,
+        commitment: Optional[str] = None
+    ) -> Optional[int]:
+        """Get token balance for our wallet by finding the associated token account.
+        
+        Returns on_error if the lookup fails.
+        """
         if self.mock_trading:
             return self.mock_token_positions.get(mint, 0)
         
         try:
-            from solders.pubkey import Pubkey
-            
-            # SPL Token Program ID
-            TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+            # Get our token accounts for this mint with a getTokenAccountsByOwner RPC call
+            # (batched with concurrent lookups)
+            accounts = await self.rpc.get_token_accounts_by_owner(self._wallet_pubkey, mint, commitment)
+            if not accounts:
+                return 0
             
-            # Get all token accounts for our wallet
-            wallet_pubkey = self.wallet.pubkey()
+            # Get the token amount from the first account
+            account_data = accounts[0].get("account", {}).get("data", {})
+            parsed = account_data.get("parsed", {}).get("info", {})
+            token_amount = parsed.get("tokenAmount", {})
+            amount = int(token_amount.get("amount", 0))
             
-            # Use getTokenAccountsByOwner RPC call
-            result = await self.rpc._request(
-                "getTokenAccountsByOwner",
-                [
-                    str(wallet_pubkey),
-                    {"mint": mint},
-                    {"encoding": "jsonParsed"}
-                ]
-            )
-            
-            if result and "value" in result:
-                accounts = result["value"]
-                if not accounts:
-                    return 0
-                # Get the token amount from the first account
-                account_data = accounts[0].get("account", {}).get("data", {})
-                parsed = account_data.get("parsed", {}).get("info", {})
-                token_amount = parsed.get("tokenAmount", {})
-                amount = int(token_amount.get("amount", 0))
-                
-                if amount > 0:
-                    logger.info(
-                        "token_balance_found",
-                        token=mint[:8],
-                        amount=amount
-                    )
-                return amount
-            
-            return 0
+            if amount > 0:
+                logger.info(
+                    "token_balance_found",
+                    token=mint[:8],
+                    amount=amount
+                )
+            return amount
         except Exception as e:
             logger.debug("get_token_balance_error", mint=mint[:8], error=str(e))
-            return 0
+            return on_error
+    
+    @staticmethod
+    def _cache_store(cache: OrderedDict, key: str, value: tuple) -> None:
+        """Insert into a bounded token cache, evicting the least recently used entry when full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > TOKEN_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
     
     async def _get_token_info(self, mint: str) -> tuple[float, float, float, float, float, int]:
         """Get market cap, token age, liquidity, volume, price change and txn count using DexScreener API.
@@ -1234,71 +1753,117 @@ class CopyTrader:
         Returns:
             tuple: (market_cap_usd, age_minutes, liquidity_usd, volume_24h_usd, price_change_1h_pct, txns_1h)
         """
-        import time
-        
         # Check cache (valid for 60 seconds)
         if mint in self.token_info_cache:
             cached_cap, cached_age, cached_liq, cached_vol, cached_price_chg, cached_txns, cached_time = self.token_info_cache[mint]
-            if time.time() - cached_time < 60:
+            elapsed = time.time() - cached_time
+            if elapsed < 60:
+                self.token_info_cache.move_to_end(mint)
                 # Adjust age for time passed since cache
-                adjusted_age = cached_age + (time.time() - cached_time) / 60
+                adjusted_age = cached_age + elapsed / 60
                 return cached_cap, adjusted_age, cached_liq, cached_vol, cached_price_chg, cached_txns
         
+        # Join the next batched request (or one already queued for this mint)
+        future = self._token_info_pending.get(mint)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._token_info_pending[mint] = future
+            if len(self._token_info_pending) >= DEXSCREENER_BATCH_MAX_MINTS:
+                self._flush_token_info()
+            elif self._token_info_flush is None:
+                self._token_info_flush = loop.call_later(DEXSCREENER_BATCH_WINDOW_SECONDS, self._flush_token_info)
+        
+        # Shielded - other callers may be waiting on the same lookup
+        return await asyncio.shield(future)
+    
+    def _flush_token_info(self) -> None:
+        """Send the queued DexScreener lookups as one request."""
+        if self._token_info_flush is not None:
+            self._token_info_flush.cancel()
+            self._token_info_flush = None
+        
+        pending, self._token_info_pending = self._token_info_pending, {}
+        if pending:
+            task = asyncio.create_task(self._fetch_token_infos(pending))
+            self._token_info_fetches.add(task)
+            task.add_done_callback(self._token_info_fetches.discard)
+    
+    async def _fetch_token_infos(self, pending: Dict[str, asyncio.Future]) -> None:
+        """Fetch DexScreener pairs for several mints at once and resolve each mint's future."""
+        pairs_by_mint = await self._fetch_dexscreener_pairs(list(pending))
+        
+        # The response caps how many pairs it returns, so one heavily traded mint can
+        # crowd the rest out - ask again on their own for any that came back empty
+        if pairs_by_mint is not None and len(pending) > 1:
+            missing = [mint for mint in pending if mint not in pairs_by_mint]
+            if missing:
+                for found in await asyncio.gather(*(self._fetch_dexscreener_pairs([mint]) for mint in missing)):
+                    if found:
+                        pairs_by_mint.update(found)
+        pairs_by_mint = pairs_by_mint or {}
+        
+        now = time.time()
+        for mint, future in pending.items():
+            info = (0, 0, 0, 0, 0, 0)
+            pairs = pairs_by_mint.get(mint)
+            if pairs:
+                try:
+                    info = self._summarize_pairs(pairs, now)
+                    self._cache_store(self.token_info_cache, mint, (*info, now))
+                except Exception as e:
+                    logger.debug("token_info_fetch_error", mint=mint[:8], error=str(e))
+            if not future.done():
+                future.set_result(info)
+    
+    async def _fetch_dexscreener_pairs(self, mints: List[str]) -> Optional[Dict[str, List[Dict]]]:
+        """One DexScreener tokens request - pairs grouped by mint, or None if it failed."""
+        # Same pairs a single-mint lookup would return: the mint on either side of the pair
+        pairs_by_mint: Dict[str, List[Dict]] = {}
         try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{mint}"
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    pairs = data.get("pairs", [])
-                    if pairs:
-                        # Get the best pair's stats (highest liquidity)
-                        market_cap = 0
-                        oldest_age = 0
-                        total_liquidity = 0
-                        total_volume_24h = 0
-                        price_change_1h = 0
-                        total_txns_1h = 0
-                        best_pair = None
-                        
-                        for pair in pairs:
-                            mc = pair.get("marketCap") or pair.get("fdv") or 0
-                            if mc > market_cap:
-                                market_cap = mc
-                                best_pair = pair  # Track the main pair
-                            
-                            # Sum up liquidity across all pairs
-                            liq = pair.get("liquidity", {}).get("usd", 0) or 0
-                            total_liquidity += liq
-                            
-                            # Sum up 24h volume across all pairs
-                            vol = pair.get("volume", {}).get("h24", 0) or 0
-                            total_volume_24h += vol
-                            
-                            # Sum up 1h transactions (buys + sells)
-                            txns = pair.get("txns", {}).get("h1", {})
-                            buys_1h = txns.get("buys", 0) or 0
-                            sells_1h = txns.get("sells", 0) or 0
-                            total_txns_1h += buys_1h + sells_1h
-                            
-                            # Get pair creation time
-                            created_at = pair.get("pairCreatedAt")
-                            if created_at:
-                                age_ms = time.time() * 1000 - created_at
-                                age_minutes = age_ms / 60000
-                                if age_minutes > oldest_age:
-                                    oldest_age = age_minutes
-                        
-                        # Get 1h price change from best pair
-                        if best_pair:
-                            price_change_1h = best_pair.get("priceChange", {}).get("h1", 0) or 0
-                        
-                        self.token_info_cache[mint] = (market_cap, oldest_age, total_liquidity, total_volume_24h, price_change_1h, total_txns_1h, time.time())
-                        return market_cap, oldest_age, total_liquidity, total_volume_24h, price_change_1h, total_txns_1h
-            
-            return 0, 0, 0, 0, 0, 0
+            url = f"{DEXSCREENER_TOKENS_API}/{','.join(mints)}"
+            async with self.session.get(url, timeout=DEXSCREENER_TIMEOUT) as resp:
+                if resp.status != 200:
+                    return None
+                pairs = orjson.loads(await resp.read()).get("pairs") or []
         except Exception as e:
-            logger.debug("token_info_fetch_error", mint=mint[:8], error=str(e))
-            return 0, 0, 0, 0, 0, 0
+            logger.debug("token_info_fetch_error", mints=len(mints), error=str(e))
+            return None
+        
+        wanted = set(mints)
+        for pair in pairs:
+            for side in ("baseToken", "quoteToken"):
+                address = pair.get(side, {}).get("address")
+                if address in wanted:
+                    pairs_by_mint.setdefault(address, []).append(pair)
+        return pairs_by_mint
+    
+    @staticmethod
+    def _summarize_pairs(pairs: List[Dict], now: float) -> tuple[float, float, float, float, float, int]:
+        """Reduce a token's DexScreener pairs to (market_cap, age_minutes, liquidity, volume_24h, price_change_1h, txns_1h)."""
+        # Main pair = highest market cap (first one wins ties)
+        best_pair = max(pairs, key=lambda p: p.get("marketCap") or p.get("fdv") or 0)
+        market_cap = best_pair.get("marketCap") or best_pair.get("fdv") or 0
+        
+        # Liquidity, 24h volume and 1h transactions (buys + sells) are summed across all pairs
+        total_liquidity = sum(p.get("liquidity", {}).get("usd", 0) or 0 for p in pairs)
+        total_volume_24h = sum(p.get("volume", {}).get("h24", 0) or 0 for p in pairs)
+        total_txns_1h = 0
+        for p in pairs:
+            txns = p.get("txns", {}).get("h1", {})
+            total_txns_1h += (txns.get("buys", 0) or 0) + (txns.get("sells", 0) or 0)
+        
+        # Age of the oldest pair
+        now_ms = now * 1000
+        oldest_age = max(
+            0,
+            max(((now_ms - p["pairCreatedAt"]) / 60000 for p in pairs if p.get("pairCreatedAt")), default=0)
+        )
+        
+        # Get 1h price change from best pair
+        price_change_1h = (best_pair.get("priceChange", {}).get("h1", 0) or 0) if market_cap > 0 else 0
+        
+        return market_cap, oldest_age, total_liquidity, total_volume_24h, price_change_1h, total_txns_1h
     
     async def _get_pumpfun_token_info(self, mint: str) -> tuple[float, float]:
         """Get token info from Pump.fun API.
@@ -1306,20 +1871,19 @@ class CopyTrader:
         Returns:
             tuple: (market_cap_usd, age_minutes)
         """
-        import time
-        
         # Check cache (valid for 30 seconds for pump.fun - things move fast)
         cache_key = f"pumpfun_{mint}"
         if cache_key in self.token_info_cache:
             cached = self.token_info_cache[cache_key]
             if len(cached) >= 3 and time.time() - cached[2] < 30:
+                self.token_info_cache.move_to_end(cache_key)
                 return cached[0], cached[1]
         
         try:
             url = f"https://frontend-api.pump.fun/coins/{mint}"
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     
                     # Get market cap in USD
                     market_cap = data.get("usd_market_cap", 0) or 0
@@ -1332,7 +1896,7 @@ class CopyTrader:
                         age_minutes = age_ms / 60000
                     
                     # Cache it
-                    self.token_info_cache[cache_key] = (market_cap, age_minutes, time.time())
+                    self._cache_store(self.token_info_cache, cache_key, (market_cap, age_minutes, time.time()))
                     logger.debug("pumpfun_api_success", mint=mint[:8], market_cap=market_cap, age=age_minutes)
                     return market_cap, age_minutes
                 else:
@@ -1349,12 +1913,11 @@ class CopyTrader:
         Returns:
             tuple: (top10_holders_pct, dev_holdings_pct, holders_count)
         """
-        import time
-        
         # Check cache (valid for 5 minutes - holder data doesn't change fast)
         if mint in self.holder_info_cache:
             cached_top10, cached_dev, cached_holders, cached_time = self.holder_info_cache[mint]
             if time.time() - cached_time < 300:  # 5 minutes
+                self.holder_info_cache.move_to_end(mint)
                 return cached_top10, cached_dev, cached_holders
         
         try:
@@ -1362,7 +1925,7 @@ class CopyTrader:
             url = f"https://api.rugcheck.xyz/v1/tokens/{mint}/report"
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     
                     # Get top holders percentage
                     top_holders = data.get("topHolders", [])
@@ -1386,7 +1949,7 @@ class CopyTrader:
                     # Get total holders count
                     holders_count = data.get("holderCount", 0) or len(top_holders)
                     
-                    self.holder_info_cache[mint] = (top10_pct, creator_pct, holders_count, time.time())
+                    self._cache_store(self.holder_info_cache, mint, (top10_pct, creator_pct, holders_count, time.time()))
                     return top10_pct, creator_pct, holders_count
             
             return 0, 0, 0
@@ -1394,10 +1957,12 @@ class CopyTrader:
             logger.debug("holder_info_fetch_error", mint=mint[:8], error=str(e))
             return 0, 0, 0
     
-    async def _clear_recent_copy(self, token_mint: str, delay: int) -> None:
-        """Remove token from recent copies after delay."""
-        await asyncio.sleep(delay)
-        self.recent_copies.discard(token_mint)
+    def _prune_recent_copies(self, now: float) -> None:
+        """Drop expired recent-copy deadlines (keeps the dict from growing forever)."""
+        if len(self.recent_copies) >= RECENT_COPY_PRUNE_SIZE:
+            self.recent_copies = {
+                mint: deadline for mint, deadline in self.recent_copies.items() if deadline > now
+            }
     
     def _format_stats(self) -> Dict:
         """Format stats for logging."""
@@ -4,6 +4,7 @@ Run with: python -m src.main_copy
 """
 
 import asyncio
+import logging
 import signal
 import sys
 from datetime import datetime
@@ -14,25 +15,30 @@ from .wallet import create_wallet
 from .rpc import RPCClient
 from .copy_trader import CopyTrader
 
-# Configure logging
-structlog.configure(
-    processors=[
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    wrapper_class=structlog.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=True,
-)
-
 logger = structlog.get_logger(__name__)
 
 
+def configure_logging(log_level: str) -> None:
+    """Configure structlog, filtered at the configured level so skipped
+    debug/info calls return immediately instead of running the processors."""
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(
+            getattr(logging, log_level.upper(), logging.INFO)
+        ),
+        context_class=dict,
+        logger_factory=structlog.PrintLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
 class CopyTradingBot:
     """Main copy trading bot class."""
     
@@ -45,10 +51,10 @@ class CopyTradingBot:
     
     async def initialize(self) -> None:
         """Initialize all components."""
-        logger.info("initializing_copy_trader")
-        
-        # Load config
+        # Load config (and set up logging from it before anything logs)
         self.config = load_config()
+        configure_logging(self.config.log_level)
+        logger.info("initializing_copy_trader")
         
         if not self.config.copy_enabled:
             logger.error("copy_trading_disabled", 
@@ -153,6 +159,12 @@ class CopyTradingBot:
 
 async def main():
     """Entry point."""
+    # Python 3.12+: tasks start running immediately instead of waiting a loop
+    # iteration, so short-lived tasks (queue consumers, warm-up) skip a scheduler hop.
+    # Set here, where the loop is created, since it applies to every task in the process.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     bot = CopyTradingBot()
     
     try:
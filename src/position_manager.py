@@ -4,18 +4,26 @@ Implements take-profit, stop-loss, and time-based exits.
 """
 
 import asyncio
+import base64
+import time
 import aiohttp
-from typing import Dict, List, Optional
+import orjson
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import structlog
+from solders.transaction import VersionedTransaction
+
+from .config import BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, JUPITER_MAX_REQUESTS_PER_SECOND
+from .rpc import RateLimiter
 
 logger = structlog.get_logger(__name__)
 
 # Jupiter API - using lite-api (public, no auth required)
 JUPITER_QUOTE_API = "https://lite-api.jup.ag/v6/quote"
 JUPITER_SWAP_API = "https://lite-api.jup.ag/v6/swap"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 # Pump.fun API for bonding curve trades
 PUMPFUN_API = "https://pumpportal.fun/api/trade-local"
@@ -34,7 +42,7 @@ class ExitReason(Enum):
     MCAP_STOP_LOSS = "mcap_stop_loss"  # Market cap dropped below threshold
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents an open position."""
     token_mint: str
@@ -66,7 +74,7 @@ class Position:
         return self.current_value_sol > self.entry_sol
 
 
-@dataclass
+@dataclass(slots=True)
 class SellResult:
     success: bool
     signature: Optional[str] = None
@@ -100,15 +108,33 @@ class PositionManager:
         rug_abandon_sol: float = 0.005,     # Abandon if worth < 0.005 SOL
         check_interval_sec: float = 60.0,   # Check prices every 60s
         mcap_stop_loss_usd: float = 0,      # 0 = disabled, sell if mcap drops below
+        session: Optional[aiohttp.ClientSession] = None,  # Reuse caller's pool if given
+        on_sell_sent: Optional[Callable[[], None]] = None,  # Called after each sell tx goes out
     ):
         self.config = config
+        self.on_sell_sent = on_sell_sent
         self.wallet = wallet_keypair
         self.rpc = rpc_client
         self.mcap_stop_loss_usd = mcap_stop_loss_usd
         
+        # Request constants, built once instead of on every quote/swap
+        self._wallet_pubkey = wallet_keypair.pubkey()
+        self._wallet_pubkey_str = str(self._wallet_pubkey)
+        self._signers = [wallet_keypair]
+        self._slippage_bps_str = str(config.slippage_bps)
+        
         # Cache for market caps
         self.mcap_cache: Dict[str, tuple[float, float]] = {}  # mint -> (mcap, timestamp)
         
+        # In-flight Jupiter quotes, so concurrent callers share one HTTP request
+        self._inflight_quotes: Dict[tuple[str, str, int], asyncio.Task] = {}
+        
+        # Throttle background price-check quotes so they never burn the Jupiter
+        # rate limit that urgent sells depend on (sells are not throttled)
+        self.quote_limiter = RateLimiter(JUPITER_MAX_REQUESTS_PER_SECOND)
+        self._quote_backoff_until: float = 0
+        self._quote_rate_limited_count = 0
+        
         # Settings
         self.max_positions = max_positions
         self.take_profit_pct = take_profit_pct
@@ -122,7 +148,8 @@ class PositionManager:
         self.positions: Dict[str, Position] = {}  # token_mint -> Position
         self.abandoned_tokens: Dict[str, float] = {}  # token_mint -> entry_sol (for stats)
         self.failed_sells: Dict[str, int] = {}  # token_mint -> token_amount (queued for retry)
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.running = False
         
         # Stats
@@ -133,7 +160,8 @@ class PositionManager:
     
     async def start(self) -> None:
         """Start the position manager."""
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         self.running = True
         
         logger.info(
@@ -153,7 +181,7 @@ class PositionManager:
     async def stop(self) -> None:
         """Stop the position manager."""
         self.running = False
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         
         logger.info(
@@ -332,31 +360,24 @@ class PositionManager:
             # Get swap transaction with HIGH priority fees
             swap_data = {
                 "quoteResponse": quote,
-                "userPublicKey": str(self.wallet.pubkey()),
+                "userPublicKey": self._wallet_pubkey_str,
                 "wrapAndUnwrapSol": True,
                 "dynamicComputeUnitLimit": True,
                 "prioritizationFeeLamports": 500000  # Very high priority for retries
             }
             
-            async with self.session.post(JUPITER_SWAP_API, json=swap_data) as resp:
+            async with self.session.post(JUPITER_SWAP_API, data=orjson.dumps(swap_data), headers=JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error = await resp.text()
                     return SellResult(success=False, error=f"swap_api: {error}")
-                swap_response = await resp.json()
+                swap_response = orjson.loads(await resp.read())
             
             # Sign and send
-            import base64
-            from solders.transaction import VersionedTransaction
-            
             swap_tx = swap_response.get("swapTransaction")
             if not swap_tx:
                 return SellResult(success=False, error="no_swap_tx")
             
-            tx_bytes = base64.b64decode(swap_tx)
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [self.wallet])
-            
-            signature = await self.rpc.send_transaction(signed_tx)
+            signature = await self._sign_and_send(base64.b64decode(swap_tx))
             
             sol_received = int(quote.get("outAmount", 0)) / 1e9
             
@@ -381,41 +402,54 @@ class PositionManager:
             await asyncio.sleep(self.check_interval)
     
     async def _check_all_positions(self) -> None:
-        """Check all positions and sell if needed."""
+        """Check all positions concurrently and sell as soon as one needs it."""
         if not self.positions:
             return
         
-        positions_to_sell = []
-        
-        for token_mint, position in list(self.positions.items()):
-            try:
-                # Update price
-                await self._update_position_value(position)
-                
-                # Check exit conditions (price-based)
-                exit_reason = self._should_exit(position)
-                
-                # Check market cap stop loss (if enabled)
-                if not exit_reason:
-                    exit_reason = await self._check_mcap_stop_loss(position)
-                
-                if exit_reason:
-                    positions_to_sell.append((token_mint, exit_reason))
-                    
-            except Exception as e:
-                logger.warning(
-                    "position_check_error",
-                    token=token_mint[:8],
-                    error=str(e)
-                )
+        checks = [
+            self._check_position(token_mint, position)
+            for token_mint, position in list(self.positions.items())
+        ]
         
-        # Execute sells
-        for token_mint, reason in positions_to_sell:
-            await self._sell_position(token_mint, reason)
+        # Sell in completion order so a slow quote for one token doesn't
+        # delay the exit of another
+        for check in asyncio.as_completed(checks):
+            token_mint, exit_reason = await check
+            if exit_reason and token_mint in self.positions:
+                await self._sell_position(token_mint, exit_reason)
+    
+    async def _check_position(self, token_mint: str, position: Position) -> tuple[str, Optional[ExitReason]]:
+        """Refresh a position's value and return its exit reason, if any."""
+        try:
+            # Update price
+            await self._update_position_value(position)
+            
+            # Check exit conditions (price-based)
+            exit_reason = self._should_exit(position)
+            
+            # Check market cap stop loss (if enabled)
+            if not exit_reason:
+                exit_reason = await self._check_mcap_stop_loss(position)
+            
+            return token_mint, exit_reason
+            
+        except Exception as e:
+            logger.warning(
+                "position_check_error",
+                token=token_mint[:8],
+                error=str(e)
+            )
+            return token_mint, None
     
     async def _update_position_value(self, position: Position) -> None:
         """Update the current value of a position."""
+        # Skip price checks while Jupiter is rate limiting us
+        if time.monotonic() < self._quote_backoff_until:
+            return
+        
         try:
+            await self.quote_limiter.acquire()
+            
             # Get quote for selling our tokens
             quote = await self._get_quote(
                 input_mint=position.token_mint,
@@ -434,8 +468,8 @@ class PositionManager:
                 logger.debug(
                     "position_updated",
                     token=position.token_mint[:8],
-                    value=f"{position.current_value_sol:.4f}",
-                    pnl=f"{position.pnl_percent:.1f}%"
+                    value=position.current_value_sol,
+                    pnl_pct=position.pnl_percent
                 )
                 
         except Exception as e:
@@ -489,8 +523,6 @@ class PositionManager:
     
     async def _get_market_cap(self, mint: str) -> float:
         """Get market cap in USD using DexScreener API."""
-        import time
-        
         # Check cache (valid for 30 seconds)
         if mint in self.mcap_cache:
             cached_cap, cached_time = self.mcap_cache[mint]
@@ -501,7 +533,7 @@ class PositionManager:
             url = f"https://api.dexscreener.com/latest/dex/tokens/{mint}"
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     pairs = data.get("pairs", [])
                     if pairs:
                         market_cap = 0
@@ -608,12 +640,19 @@ class PositionManager:
         except Exception as e:
             return SellResult(success=False, error=str(e), reason=reason)
     
+    async def _sign_and_send(self, tx_bytes: bytes) -> str:
+        """Sign a serialized transaction from the swap API with our wallet and send it."""
+        tx = VersionedTransaction.from_bytes(tx_bytes)
+        signed_tx = VersionedTransaction(tx.message, self._signers)
+        signature = await self.rpc.send_transaction(signed_tx)
+        # Everything we send from here is a sell - our SOL balance just changed
+        if self.on_sell_sent:
+            self.on_sell_sent()
+        return signature
+    
     async def _execute_sell(self, position: Position) -> SellResult:
         """Execute a sell transaction."""
         try:
-            import base64
-            from solders.transaction import VersionedTransaction
-            
             # Use Pump.fun API for pump.fun tokens
             if position.dex == "pump.fun":
                 return await self._execute_pumpfun_sell(position)
@@ -632,27 +671,23 @@ class PositionManager:
             # Get swap transaction with HIGH priority fees for fast execution
             swap_data = {
                 "quoteResponse": quote,
-                "userPublicKey": str(self.wallet.pubkey()),
+                "userPublicKey": self._wallet_pubkey_str,
                 "wrapAndUnwrapSol": True,
                 "dynamicComputeUnitLimit": True,
                 "prioritizationFeeLamports": 100000  # High priority ~0.0001 SOL for fast confirmation
             }
             
-            async with self.session.post(JUPITER_SWAP_API, json=swap_data) as resp:
+            async with self.session.post(JUPITER_SWAP_API, data=orjson.dumps(swap_data), headers=JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error = await resp.text()
                     return SellResult(success=False, error=f"swap_api: {error}")
-                swap_response = await resp.json()
+                swap_response = orjson.loads(await resp.read())
             
             swap_tx = swap_response.get("swapTransaction")
             if not swap_tx:
                 return SellResult(success=False, error="no_swap_tx")
             
-            tx_bytes = base64.b64decode(swap_tx)
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [self.wallet])
-            
-            signature = await self.rpc.send_transaction(signed_tx)
+            signature = await self._sign_and_send(base64.b64decode(swap_tx))
             
             sol_received = int(quote.get("outAmount", 0)) / 1e9
             
@@ -668,15 +703,12 @@ class PositionManager:
     async def _execute_pumpfun_sell(self, position: Position) -> SellResult:
         """Execute a sell on Pump.fun's bonding curve."""
         try:
-            import base64
-            from solders.transaction import VersionedTransaction
-            
             # Request transaction from PumpPortal - sell 100% of holdings
             # Use high slippage for pump.fun (tokens move fast) - minimum 15%
             pumpfun_slippage = max(self.config.slippage_bps / 100, 15)
             
             payload = {
-                "publicKey": str(self.wallet.pubkey()),
+                "publicKey": self._wallet_pubkey_str,
                 "action": "sell",
                 "mint": position.token_mint,
                 "denominatedInSol": "false",
@@ -691,17 +723,15 @@ class PositionManager:
                 token=position.token_mint[:8]
             )
             
-            async with self.session.post(PUMPFUN_API, json=payload) as resp:
+            async with self.session.post(PUMPFUN_API, data=orjson.dumps(payload), headers=JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     return SellResult(success=False, error=f"pumpfun_api: {error_text}")
                 
                 tx_bytes = await resp.read()
             
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [self.wallet])
-            
-            signature = await self.rpc.send_transaction(signed_tx)
+            # Sign with our wallet and send
+            signature = await self._sign_and_send(tx_bytes)
             
             logger.info(
                 "pumpfun_sell_success",
@@ -725,23 +755,53 @@ class PositionManager:
         output_mint: str, 
         amount: int
     ) -> Optional[Dict]:
-        """Get a Jupiter quote."""
+        """Get a Jupiter quote, coalescing identical concurrent requests."""
+        key = (input_mint, output_mint, amount)
+        task = self._inflight_quotes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_quote(input_mint, output_mint, amount))
+            self._inflight_quotes[key] = task
+            task.add_done_callback(lambda _: self._inflight_quotes.pop(key, None))
+        
+        # Shield so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+    
+    async def _fetch_quote(
+        self, 
+        input_mint: str, 
+        output_mint: str, 
+        amount: int
+    ) -> Optional[Dict]:
+        """Fetch a Jupiter quote."""
         try:
             params = {
                 "inputMint": input_mint,
                 "outputMint": output_mint,
                 "amount": str(amount),
-                "slippageBps": str(self.config.slippage_bps)
+                "slippageBps": self._slippage_bps_str
             }
             
             async with self.session.get(JUPITER_QUOTE_API, params=params) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    self._quote_rate_limited_count = 0
+                    return orjson.loads(await resp.read())
+                if resp.status == 429:
+                    self._apply_quote_backoff()
                 return None
                 
         except Exception:
             return None
     
+    def _apply_quote_backoff(self) -> None:
+        """Back off background price checks after a 429 from Jupiter."""
+        self._quote_rate_limited_count += 1
+        backoff = min(
+            BACKOFF_BASE_SECONDS * (2 ** self._quote_rate_limited_count),
+            BACKOFF_MAX_SECONDS
+        )
+        self._quote_backoff_until = time.monotonic() + backoff
+        logger.warning("jupiter_rate_limited", backoff_seconds=backoff)
+    
     def get_positions_summary(self) -> Dict:
         """Get a summary of all positions."""
         return {
@@ -4,6 +4,7 @@ Supports Helius/QuickNode with rate limiting and backoff.
 """
 
 import asyncio
+import base64
 import time
 from typing import Optional, Dict, Any, List
 import aiohttp
@@ -17,6 +18,16 @@ from .config import Config, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, MAX_REQUE
 
 logger = structlog.get_logger()
 
+# Connection pool tuning - keep TLS connections to the RPC warm between calls
+RPC_CONNECTION_LIMIT = 100
+RPC_CONNECTION_LIMIT_PER_HOST = 32
+RPC_DNS_CACHE_TTL_SECONDS = 300
+RPC_KEEPALIVE_TIMEOUT_SECONDS = 60
+
+# Small reads (balances, token accounts) made in the same event-loop pass go out as one
+# batch request, up to this many calls
+RPC_BATCH_MAX_CALLS = 16
+
 
 class RateLimiter:
     """Simple rate limiter using token bucket algorithm."""
@@ -53,11 +64,28 @@ class RPCClient:
         self._session: Optional[aiohttp.ClientSession] = None
         self._backoff_until: float = 0
         self._consecutive_errors = 0
+        
+        # Calls waiting for the next batch flush: (method, params, future)
+        self._pending_calls: List[tuple[str, List[Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        # Cleared the first time the RPC rejects a batch - later batches go out as single calls
+        self._batch_supported = True
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
+        """Get or create aiohttp session (pooled, keep-alive connections)."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=RPC_CONNECTION_LIMIT,
+                limit_per_host=RPC_CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=RPC_DNS_CACHE_TTL_SECONDS,
+                keepalive_timeout=RPC_KEEPALIVE_TIMEOUT_SECONDS,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10, connect=3)
+            )
         return self._session
     
     async def close(self) -> None:
@@ -126,19 +154,196 @@ class RPCClient:
             logger.error("rpc_request_failed", method=method, error=str(e))
             raise
     
+    async def _request_batch(self, calls: List[tuple[str, List[Any]]]) -> List[Any]:
+        """Make a JSON-RPC batch request.
+        
+        Args:
+            calls: List of (method, params) tuples
+        
+        Returns:
+            Results in the same order as calls (an Exception for calls that errored).
+            Falls back to individual requests if the RPC doesn't accept batches.
+        """
+        if not calls:
+            return []
+        if not self._batch_supported:
+            return await self._request_each(calls)
+        
+        await self._wait_for_backoff()
+        await self.rate_limiter.acquire()
+        
+        session = await self._get_session()
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        
+        try:
+            async with session.post(
+                self.rpc_url,
+                json=payload,
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                if response.status == 429:
+                    self._apply_backoff()
+                    raise Exception("Rate limited by RPC")
+                
+                if not 400 <= response.status < 500:
+                    response.raise_for_status()
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None  # Non-JSON error page
+                status = response.status
+                
+        except aiohttp.ClientError as e:
+            self._apply_backoff()
+            logger.error("rpc_batch_request_failed", calls=len(calls), error=str(e))
+            raise
+        
+        if not isinstance(data, list):
+            error = data.get("error", data) if isinstance(data, dict) else data
+            if self._is_batch_unsupported_error(error):
+                # The plan refuses batches - send these and every later batch as single calls
+                logger.warning("rpc_batch_unsupported", error=str(error))
+                self._batch_supported = False
+            else:
+                # Some other rejection (bad key, payload too large, ...) - only this batch
+                # goes out as single calls, which surface their own errors
+                logger.warning("rpc_batch_rejected", status=status, error=str(error))
+            return await self._request_each(calls)
+        
+        # Responses may come back in any order - match them by id
+        results: List[Any] = [None] * len(calls)
+        for item in data:
+            idx = item.get("id")
+            if not isinstance(idx, int) or not 0 <= idx < len(calls):
+                continue
+            if "error" in item:
+                error = item["error"]
+                message = error.get("message", error) if isinstance(error, dict) else error
+                results[idx] = Exception(f"RPC error: {message}")
+            else:
+                results[idx] = item.get("result")
+        
+        for idx, result in enumerate(results):
+            if result is None:
+                results[idx] = Exception(f"RPC error: no response for {calls[idx][0]} in batch")
+        
+        self._reset_backoff()
+        return results
+    
+    @staticmethod
+    def _is_batch_unsupported_error(error: Any) -> bool:
+        """Whether a batch response is the RPC saying it doesn't take batch requests."""
+        message = error.get("message", "") if isinstance(error, dict) else error
+        return isinstance(message, str) and "batch" in message.lower()
+    
+    async def _request_each(self, calls: List[tuple[str, List[Any]]]) -> List[Any]:
+        """Send calls as concurrent individual requests (results shaped like _request_batch)."""
+        return await asyncio.gather(
+            *(self._request(method, params) for method, params in calls),
+            return_exceptions=True
+        )
+    
+    async def _batched_request(self, method: str, params: List[Any]) -> Any:
+        """Make a JSON-RPC call that may share a batch request with concurrent calls.
+        
+        Calls made in the same event-loop pass (up to RPC_BATCH_MAX_CALLS) are
+        sent together, so they use one HTTP round trip and one rate limiter
+        token. A call with nothing to share with goes out as a plain request
+        without waiting on a timer. Raises like _request if the call fails.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_calls.append((method, params, future))
+        
+        if len(self._pending_calls) >= RPC_BATCH_MAX_CALLS:
+            self._flush_pending_calls()
+        elif self._flush_handle is None:
+            # Runs right after the tasks already scheduled this pass, so calls from
+            # sibling tasks (e.g. started together with create_task) join the batch
+            self._flush_handle = loop.call_soon(self._flush_pending_calls)
+        
+        return await future
+    
+    def _flush_pending_calls(self) -> None:
+        """Send everything queued by _batched_request."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        calls, self._pending_calls = self._pending_calls, []
+        if calls:
+            task = asyncio.create_task(self._send_pending_calls(calls))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _send_pending_calls(self, calls: List[tuple[str, List[Any], asyncio.Future]]) -> None:
+        """Send queued calls (as a plain request if there's only one) and resolve their futures."""
+        try:
+            if len(calls) == 1:
+                method, params, _ = calls[0]
+                results = [await self._request(method, params)]
+            else:
+                results = await self._request_batch([(method, params) for method, params, _ in calls])
+        except Exception as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), result in zip(calls, results):
+            if future.done():
+                continue  # Caller gave up waiting
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
     async def get_balance(self, pubkey: Pubkey) -> int:
         """Get SOL balance in lamports."""
-        result = await self._request("getBalance", [str(pubkey)])
+        result = await self._batched_request("getBalance", [str(pubkey)])
         return result.get("value", 0)
     
+    async def get_balances(self, pubkeys: List[Pubkey]) -> List[Optional[int]]:
+        """Get SOL balances (lamports) for several accounts in one batch request.
+        
+        Returns None for any account whose lookup failed. If the batch request
+        itself fails, each balance is fetched on its own instead.
+        """
+        try:
+            results = await self._request_batch([("getBalance", [str(pk)]) for pk in pubkeys])
+        except Exception as e:
+            logger.debug("rpc_balances_batch_failed", error=str(e))
+            balances = await asyncio.gather(*(self.get_balance(pk) for pk in pubkeys), return_exceptions=True)
+            return [b if isinstance(b, int) else None for b in balances]
+        return [r.get("value", 0) if isinstance(r, dict) else None for r in results]
+    
     async def get_latest_blockhash(self) -> str:
         """Get the latest blockhash."""
         result = await self._request("getLatestBlockhash", [{"commitment": "finalized"}])
         return result["value"]["blockhash"]
     
+    async def get_token_accounts_by_owner(
+        self,
+        owner: Pubkey,
+        mint: str,
+        commitment: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get an owner's token accounts (jsonParsed) for one mint (node default commitment unless given)."""
+        options: Dict[str, Any] = {"encoding": "jsonParsed"}
+        if commitment:
+            options["commitment"] = commitment
+        result = await self._batched_request(
+            "getTokenAccountsByOwner",
+            [str(owner), {"mint": mint}, options]
+        )
+        return result.get("value", []) if isinstance(result, dict) else []
+    
     async def get_token_account_balance(self, token_account: str) -> Dict[str, Any]:
         """Get token account balance."""
-        result = await self._request("getTokenAccountBalance", [token_account])
+        result = await self._batched_request("getTokenAccountBalance", [token_account])
         return result.get("value", {})
     
     async def send_transaction(
@@ -148,9 +353,7 @@ class RPCClient:
     ) -> str:
         """Send a signed transaction and return signature."""
         # Serialize transaction to base64
-        tx_bytes = bytes(transaction)
-        import base64
-        tx_base64 = base64.b64encode(tx_bytes).decode('utf-8')
+        tx_base64 = base64.b64encode(bytes(transaction)).decode('ascii')
         
         options = {
             "skipPreflight": skip_preflight,
@@ -221,7 +424,6 @@ class RPCClient:
     
     async def simulate_transaction(self, transaction: VersionedTransaction) -> Dict[str, Any]:
         """Simulate a transaction before sending."""
-        import base64
         tx_bytes = bytes(transaction)
         tx_base64 = base64.b64encode(tx_bytes).decode('utf-8')
         
@@ -232,8 +434,12 @@ class RPCClient:
         
         return result.get("value", {})
     
-    async def get_signatures_for_address(self, pubkey: Pubkey, limit: int = 20) -> List[Dict]:
-        """Get recent transaction signatures for an address."""
+    async def get_signatures_for_address(self, pubkey: Pubkey, limit: int = 20) -> List[str]:
+        """Get recent transaction signatures for an address (signatures only)."""
+        return [info["signature"] for info in await self.get_signature_infos(pubkey, limit)]
+    
+    async def get_signature_infos(self, pubkey: Pubkey, limit: int = 20) -> List[Dict]:
+        """Get recent signature info dicts (slot, blockTime, err, ...) for an address."""
         result = await self._request(
             "getSignaturesForAddress",
             [str(pubkey), {"limit": limit}]
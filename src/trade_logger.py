@@ -3,12 +3,13 @@ Trade Logger - Records all trades for analysis and debugging.
 Saves trade history to JSON for later comparison with tracked wallets.
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
 from pathlib import Path
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -57,36 +58,46 @@ class TradeLogger:
     def __init__(self, history_file: str = TRADE_HISTORY_FILE):
         self.history_file = Path(history_file)
         self.trades: List[TradeRecord] = []
+        # Single worker keeps appends ordered and off the event loop
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trade_logger")
         self._load_history()
     
+    def _read_history(self) -> List[Dict[str, Any]]:
+        """Read the full trade history file (empty list if missing)."""
+        if not self.history_file.exists():
+            return []
+        return orjson.loads(self.history_file.read_bytes())
+    
     def _load_history(self) -> None:
         """Load existing trade history."""
         if self.history_file.exists():
             try:
-                with open(self.history_file, 'r') as f:
-                    data = json.load(f)
-                    # Don't load into memory - just append new trades
-                    logger.info("trade_history_loaded", count=len(data))
+                data = self._read_history()
+                # Don't load into memory - just append new trades
+                logger.info("trade_history_loaded", count=len(data))
             except Exception as e:
                 logger.warning("history_load_failed", error=str(e))
     
     def _save_trade(self, trade: TradeRecord) -> None:
-        """Append trade to history file."""
+        """Queue trade to be appended to the history file in the background."""
+        self._writer.submit(self._append_trade, trade)
+    
+    def _append_trade(self, trade: TradeRecord) -> None:
+        """Append a trade record to the history file (runs on the writer thread)."""
         try:
             # Load existing
-            existing = []
-            if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    existing = json.load(f)
+            existing = self._read_history()
             
-            # Append new
-            existing.append(asdict(trade))
+            # Append new (converted here so asdict's deep copy stays off the event loop)
+            record = asdict(trade)
+            existing.append(record)
             
-            # Save
-            with open(self.history_file, 'w') as f:
-                json.dump(existing, f, indent=2)
+            # Save via temp file so readers never see a half-written file
+            tmp_file = self.history_file.with_suffix(".tmp")
+            tmp_file.write_bytes(orjson.dumps(existing, option=orjson.OPT_INDENT_2))
+            tmp_file.replace(self.history_file)
             
-            logger.debug("trade_saved", token=trade.token_mint[:8])
+            logger.debug("trade_saved", token=record["token_mint"][:8])
         except Exception as e:
             logger.error("trade_save_failed", error=str(e))
     
@@ -236,38 +247,51 @@ class TradeLogger:
             if not self.history_file.exists():
                 return {"total_trades": 0}
             
-            with open(self.history_file, 'r') as f:
-                trades = json.load(f)
-            
-            buys = [t for t in trades if t.get("trade_type") == "buy" and t.get("success")]
-            sells = [t for t in trades if t.get("trade_type") == "sell" and t.get("success")]
-            abandons = [t for t in trades if t.get("trade_type") == "abandon"]
-            
-            total_invested = sum(t.get("our_sol_amount", 0) for t in buys)
-            total_returned = sum(t.get("our_sol_amount", 0) for t in sells)
-            total_lost_to_rugs = sum(t.get("entry_sol", 0) for t in abandons)
+            trades = self._read_history()
             
-            total_pnl = sum(t.get("pnl_sol", 0) for t in sells)
+            # Single pass over the history
+            buys = sells = abandons = 0
+            winning_sells = losing_sells = 0
+            total_invested = total_returned = total_lost_to_rugs = 0
+            total_pnl = total_delay = 0
             
-            avg_delay = sum(t.get("delay_seconds", 0) for t in buys) / len(buys) if buys else 0
+            for t in trades:
+                trade_type = t.get("trade_type")
+                if trade_type == "buy":
+                    if t.get("success"):
+                        buys += 1
+                        total_invested += t.get("our_sol_amount", 0)
+                        total_delay += t.get("delay_seconds", 0)
+                elif trade_type == "sell":
+                    if t.get("success"):
+                        sells += 1
+                        total_returned += t.get("our_sol_amount", 0)
+                        pnl = t.get("pnl_sol", 0)
+                        total_pnl += pnl
+                        if pnl > 0:
+                            winning_sells += 1
+                        elif pnl < 0:
+                            losing_sells += 1
+                elif trade_type == "abandon":
+                    abandons += 1
+                    total_lost_to_rugs += t.get("entry_sol", 0)
             
-            winning_sells = [t for t in sells if t.get("pnl_sol", 0) > 0]
-            losing_sells = [t for t in sells if t.get("pnl_sol", 0) < 0]
+            avg_delay = total_delay / buys if buys else 0
             
             return {
                 "total_trades": len(trades),
-                "buys": len(buys),
-                "sells": len(sells),
-                "abandons": len(abandons),
+                "buys": buys,
+                "sells": sells,
+                "abandons": abandons,
                 "total_invested_sol": total_invested,
                 "total_returned_sol": total_returned,
                 "total_lost_to_rugs_sol": total_lost_to_rugs,
                 "realized_pnl_sol": total_pnl,
                 "net_pnl_sol": total_pnl - total_lost_to_rugs,
-                "win_rate": len(winning_sells) / len(sells) * 100 if sells else 0,
+                "win_rate": winning_sells / sells * 100 if sells else 0,
                 "avg_delay_seconds": avg_delay,
-                "winning_trades": len(winning_sells),
-                "losing_trades": len(losing_sells)
+                "winning_trades": winning_sells,
+                "losing_trades": losing_sells
             }
         except Exception as e:
             logger.error("summary_failed", error=str(e))
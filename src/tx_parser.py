@@ -3,6 +3,7 @@ Transaction Parser - Analyzes Solana transactions to detect swaps.
 Identifies buys/sells on Pump.fun, Jupiter, Raydium, etc.
 """
 
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -23,6 +24,12 @@ NATIVE_SOL_MINT = "So11111111111111111111111111111111111111112"
 USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
 USDT_MINT = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
 
+# Quote-side mints (SOL and stables), built once at import
+QUOTE_MINTS = frozenset((NATIVE_SOL_MINT, USDC_MINT, USDT_MINT))
+
+# Decoded account keys kept per signature (same tx can show up for several wallets)
+ACCOUNT_KEYS_CACHE_SIZE = 256
+
 
 class SwapType(Enum):
     BUY = "buy"      # SOL/Stable → Token
@@ -30,7 +37,7 @@ class SwapType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSwap:
     """Represents a parsed swap from a transaction."""
     swap_type: SwapType
@@ -69,6 +76,7 @@ class TransactionParser:
             min_sol_value: Minimum SOL value to consider (filters dust)
         """
         self.min_sol_value = min_sol_value
+        self._account_keys_cache: OrderedDict[str, List[str]] = OrderedDict()
     
     def parse_transaction(self, tx_data: Dict[str, Any], wallet: str) -> Optional[ParsedSwap]:
         """
@@ -92,16 +100,9 @@ class TransactionParser:
             transaction = tx_data.get("transaction", {})
             message = transaction.get("message", {})
             
-            # Get account keys
-            account_keys = self._get_account_keys(message, meta)
-            
-            # Log programs involved
-            programs_involved = [k for k in account_keys if k in [PUMP_FUN_PROGRAM, JUPITER_V6_PROGRAM, RAYDIUM_AMM_PROGRAM, RAYDIUM_CLMM_PROGRAM]]
-            logger.debug("tx_programs", wallet=wallet[:8], programs=len(programs_involved), has_pump=PUMP_FUN_PROGRAM in account_keys)
-            
-            # Get instructions
-            instructions = message.get("instructions", [])
-            inner_instructions = meta.get("innerInstructions", [])
+            # Get account keys (cached by signature)
+            signatures = transaction.get("signatures") or [None]
+            account_keys = self._get_account_keys_cached(signatures[0], message, meta)
             
             # Try to detect swap from different DEXes
             swap = None
@@ -122,7 +123,7 @@ class TransactionParser:
                 return swap
             
             # Fallback: detect from balance changes
-            swap = self._parse_from_balance_changes(tx_data, wallet, meta)
+            swap = self._parse_from_balance_changes(tx_data, wallet, meta, account_keys)
             if swap:
                 return swap
             
@@ -132,6 +133,23 @@ class TransactionParser:
             logger.warning("parse_error", error=str(e))
             return None
     
+    def _get_account_keys_cached(self, signature: Optional[str], message: Dict, meta: Dict) -> List[str]:
+        """Get account keys, reusing the decode if we've seen this signature recently."""
+        if not signature:
+            return self._get_account_keys(message, meta)
+        
+        cache = self._account_keys_cache
+        keys = cache.get(signature)
+        if keys is not None:
+            cache.move_to_end(signature)
+            return keys
+        
+        keys = self._get_account_keys(message, meta)
+        cache[signature] = keys
+        if len(cache) > ACCOUNT_KEYS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return keys
+    
     def _get_account_keys(self, message: Dict, meta: Dict) -> List[str]:
         """Extract all account keys from transaction."""
         keys = []
@@ -166,18 +184,12 @@ class TransactionParser:
         logger.debug("pump_fun_program_found", wallet=wallet[:8])
         meta = tx_data.get("meta", {})
         
-        # Get SOL balance change for the wallet (first signer)
-        account_keys_list = self._get_account_keys(
-            tx_data.get("transaction", {}).get("message", {}), 
-            meta
-        )
-        
         # For pump.fun, the fee payer (index 0) is usually the trader
         # Try to find wallet in account keys, fallback to index 0
         wallet_index = -1
-        if wallet in account_keys_list:
-            wallet_index = account_keys_list.index(wallet)
-        elif len(account_keys_list) > 0:
+        if wallet in account_keys:
+            wallet_index = account_keys.index(wallet)
+        elif len(account_keys) > 0:
             # Wallet might be interacting via different account, use first signer
             wallet_index = 0
         
@@ -194,12 +206,12 @@ class TransactionParser:
         
         for b in meta.get("preTokenBalances", []):
             mint = b.get("mint")
-            if mint and mint not in (NATIVE_SOL_MINT, USDC_MINT, USDT_MINT):
+            if mint and mint not in QUOTE_MINTS:
                 pre_balances_all[mint] = int(b.get("uiTokenAmount", {}).get("amount", "0"))
         
         for b in meta.get("postTokenBalances", []):
             mint = b.get("mint")
-            if mint and mint not in (NATIVE_SOL_MINT, USDC_MINT, USDT_MINT):
+            if mint and mint not in QUOTE_MINTS:
                 post_balances_all[mint] = int(b.get("uiTokenAmount", {}).get("amount", "0"))
         
         # Find token that changed
@@ -265,7 +277,7 @@ class TransactionParser:
             return None
         
         # Use same balance-change logic as pump.fun
-        return self._parse_from_balance_changes(tx_data, wallet, meta, dex="jupiter")
+        return self._parse_from_balance_changes(tx_data, wallet, meta, account_keys, dex="jupiter")
     
     def _parse_raydium(
         self, 
@@ -278,13 +290,14 @@ class TransactionParser:
         if RAYDIUM_AMM_PROGRAM not in account_keys and RAYDIUM_CLMM_PROGRAM not in account_keys:
             return None
         
-        return self._parse_from_balance_changes(tx_data, wallet, meta, dex="raydium")
+        return self._parse_from_balance_changes(tx_data, wallet, meta, account_keys, dex="raydium")
     
     def _parse_from_balance_changes(
         self, 
         tx_data: Dict, 
         wallet: str, 
         meta: Dict,
+        account_keys: List[str],
         dex: str = "unknown"
     ) -> Optional[ParsedSwap]:
         """
@@ -304,10 +317,6 @@ class TransactionParser:
                 post_balances[b.get("mint")] = int(b.get("uiTokenAmount", {}).get("amount", "0"))
         
         # Get SOL balance change
-        account_keys = self._get_account_keys(
-            tx_data.get("transaction", {}).get("message", {}),
-            meta
-        )
         wallet_index = account_keys.index(wallet) if wallet in account_keys else -1
         
         sol_change = 0
@@ -322,7 +331,7 @@ class TransactionParser:
         
         all_mints = set(pre_balances.keys()) | set(post_balances.keys())
         for mint in all_mints:
-            if mint in (NATIVE_SOL_MINT, USDC_MINT, USDT_MINT):
+            if mint in QUOTE_MINTS:
                 continue
             
             pre_amount = pre_balances.get(mint, 0)
@@ -23,6 +23,8 @@ class Wallet:
         """Initialize wallet from configuration."""
         self.config = config
         self._keypair: Optional[Keypair] = None
+        self._pubkey: Optional[Pubkey] = None
+        self._address: Optional[str] = None
         self._load_keypair()
     
     def _load_keypair(self) -> None:
@@ -40,9 +42,13 @@ class Wallet:
             else:
                 raise ValueError(f"Invalid private key length: {len(private_key_bytes)}")
             
+            # Derive once - keypair.pubkey() allocates a new Pubkey on every call
+            self._pubkey = self._keypair.pubkey()
+            self._address = str(self._pubkey)
+            
             logger.info(
                 "wallet_loaded",
-                address=str(self.pubkey),
+                address=self._address,
                 network=self.config.network
             )
         except Exception as e:
@@ -59,12 +65,16 @@ class Wallet:
     @property
     def pubkey(self) -> Pubkey:
         """Get the public key."""
-        return self.keypair.pubkey()
+        if self._pubkey is None:
+            raise ValueError("Wallet not initialized")
+        return self._pubkey
     
     @property
     def address(self) -> str:
         """Get the wallet address as string."""
-        return str(self.pubkey)
+        if self._address is None:
+            raise ValueError("Wallet not initialized")
+        return self._address
     
     def sign_transaction(self, transaction: Transaction) -> Transaction:
         """Sign a legacy transaction."""
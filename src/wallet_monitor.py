@@ -1,19 +1,32 @@
 """
 Wallet Monitor - Tracks transactions from target wallets.
 Polls Helius RPC for recent transactions and detects new ones.
+With a websocket URL configured, logsSubscribe pushes new signatures
+and polling slows down to a backstop.
 """
 
 import asyncio
 import aiohttp
+import time
 from typing import List, Dict, Set, Optional, Callable, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Max concurrent getTransaction requests per poll (keeps us under RPC rate limits)
+MAX_CONCURRENT_TX_FETCHES = 8
 
-@dataclass
+# Websocket push: poll interval while the subscription is live (catches anything
+# the socket dropped), and reconnect backoff bounds
+WS_BACKSTOP_POLL_SECONDS = 15.0
+WS_RECONNECT_MIN_SECONDS = 1.0
+WS_RECONNECT_MAX_SECONDS = 30.0
+WS_HEARTBEAT_SECONDS = 30.0
+
+
+@dataclass(slots=True)
 class WalletTransaction:
     """Represents a transaction from a monitored wallet."""
     signature: str
@@ -22,12 +35,14 @@ class WalletTransaction:
     slot: int
     success: bool
     raw_tx: Dict[str, Any]
+    detected_at: float = field(default_factory=time.monotonic)  # When we picked it up (monotonic clock)
 
 
 class WalletMonitor:
     """
     Monitors target wallets for new transactions.
-    Uses polling to detect new transactions in real-time.
+    Uses polling to detect new transactions in real-time, or a logsSubscribe
+    websocket when ws_url is set (polling stays on as the fallback).
     """
     
     def __init__(
@@ -35,18 +50,33 @@ class WalletMonitor:
         rpc_url: str,
         target_wallets: List[str],
         poll_interval_ms: int = 3000,
-        on_transaction: Optional[Callable[[WalletTransaction], Any]] = None
+        on_transaction: Optional[Callable[[WalletTransaction], Any]] = None,
+        ws_url: Optional[str] = None
     ):
         self.rpc_url = rpc_url
+        self.ws_url = ws_url
         self.target_wallets = target_wallets
         self.poll_interval = poll_interval_ms / 1000.0
         self.on_transaction = on_transaction
         
         # Track seen signatures to avoid duplicates
         self.seen_signatures: Dict[str, Set[str]] = {w: set() for w in target_wallets}
+        # Short wallet labels for logs, built once per wallet
+        self._wallet_short: Dict[str, str] = {w: w[:8] + "..." for w in target_wallets}
         self.session: Optional[aiohttp.ClientSession] = None
         self.running = False
         
+        # Bounds concurrent tx fetches across all wallets
+        self._fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TX_FETCHES)
+        
+        # Websocket subscription state (only used with ws_url)
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._ws_task: Optional[asyncio.Task] = None
+        self._ws_request_id = 0
+        self._ws_pending: Dict[int, str] = {}  # subscribe request id -> wallet
+        self._ws_subscriptions: Dict[int, str] = {}  # subscription id -> wallet
+        self._ws_tasks: Set[asyncio.Task] = set()
+        
     async def start(self) -> None:
         """Start the wallet monitor."""
         self.session = aiohttp.ClientSession()
@@ -55,41 +85,55 @@ class WalletMonitor:
         logger.info(
             "wallet_monitor_started",
             wallets=len(self.target_wallets),
-            poll_interval_ms=int(self.poll_interval * 1000)
+            poll_interval_ms=int(self.poll_interval * 1000),
+            websocket=bool(self.ws_url)
         )
         
         # Initialize seen signatures with recent transactions
         await self._initialize_seen_signatures()
         
-        # Start polling loop
+        if self.ws_url:
+            self._ws_task = asyncio.create_task(self._websocket_loop())
+        
+        # Start polling loop (just a backstop while the websocket is up)
         while self.running:
             try:
                 await self._poll_all_wallets()
             except Exception as e:
                 logger.error("poll_error", error=str(e))
             
-            await asyncio.sleep(self.poll_interval)
+            if self._push_covers_all_wallets():
+                await asyncio.sleep(max(self.poll_interval, WS_BACKSTOP_POLL_SECONDS))
+            else:
+                await asyncio.sleep(self.poll_interval)
     
     async def stop(self) -> None:
         """Stop the wallet monitor."""
         self.running = False
+        if self._ws_task:
+            self._ws_task.cancel()
+        for task in list(self._ws_tasks):
+            task.cancel()
         if self.session:
             await self.session.close()
         logger.info("wallet_monitor_stopped")
     
     async def _initialize_seen_signatures(self) -> None:
         """Load recent signatures to avoid copying old transactions."""
-        for wallet in self.target_wallets:
-            try:
-                signatures = await self._get_recent_signatures(wallet, limit=20)
-                self.seen_signatures[wallet] = set(signatures)
-                logger.info(
-                    "initialized_wallet",
-                    wallet=wallet[:8] + "...",
-                    recent_txs=len(signatures)
-                )
-            except Exception as e:
-                logger.error("init_wallet_failed", wallet=wallet[:8], error=str(e))
+        await asyncio.gather(*(self._initialize_wallet(w) for w in list(self.target_wallets)))
+    
+    async def _initialize_wallet(self, wallet: str) -> None:
+        """Load recent signatures for a single wallet."""
+        try:
+            signatures = await self._get_recent_signatures(wallet, limit=20)
+            self.seen_signatures[wallet] = set(signatures)
+            logger.info(
+                "initialized_wallet",
+                wallet=wallet[:8] + "...",
+                recent_txs=len(signatures)
+            )
+        except Exception as e:
+            logger.error("init_wallet_failed", wallet=wallet[:8], error=str(e))
     
     async def _get_recent_signatures(self, wallet: str, limit: int = 10) -> List[str]:
         """Get recent transaction signatures for a wallet."""
@@ -111,19 +155,19 @@ class WalletMonitor:
         
         return [tx["signature"] for tx in data["result"]]
     
-    async def _get_transaction(self, signature: str) -> Optional[Dict]:
+    async def _get_transaction(self, signature: str, commitment: Optional[str] = None) -> Optional[Dict]:
         """Get full transaction details."""
+        options = {
+            "encoding": "jsonParsed",
+            "maxSupportedTransactionVersion": 0
+        }
+        if commitment:
+            options["commitment"] = commitment
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "getTransaction",
-            "params": [
-                signature,
-                {
-                    "encoding": "jsonParsed",
-                    "maxSupportedTransactionVersion": 0
-                }
-            ]
+            "params": [signature, options]
         }
         
         async with self.session.post(self.rpc_url, json=payload) as resp:
@@ -131,59 +175,253 @@ class WalletMonitor:
         
         return data.get("result")
     
+    async def _get_transactions(self, signatures: List[str]) -> List[Optional[Dict]]:
+        """Get full transaction details for several signatures in one JSON-RPC batch."""
+        if len(signatures) == 1:
+            return [await self._get_transaction(signatures[0])]
+        
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTransaction",
+                "params": [
+                    sig,
+                    {
+                        "encoding": "jsonParsed",
+                        "maxSupportedTransactionVersion": 0
+                    }
+                ]
+            }
+            for i, sig in enumerate(signatures)
+        ]
+        
+        async with self.session.post(self.rpc_url, json=payload) as resp:
+            data = await resp.json()
+        
+        if not isinstance(data, list):
+            # Some RPC plans reject batch requests - fall back to parallel single fetches
+            logger.debug("rpc_batch_unsupported", error=str(data.get("error") if isinstance(data, dict) else data))
+            fetched = await asyncio.gather(
+                *(self._fetch_one(sig) for sig in signatures),
+                return_exceptions=True
+            )
+            return [tx if isinstance(tx, dict) else None for tx in fetched]
+        
+        # Match responses back to requests by id
+        results: List[Optional[Dict]] = [None] * len(signatures)
+        for item in data:
+            idx = item.get("id")
+            if isinstance(idx, int) and 0 <= idx < len(signatures):
+                results[idx] = item.get("result")
+        return results
+    
     async def _poll_all_wallets(self) -> None:
-        """Poll all target wallets for new transactions."""
-        for wallet in self.target_wallets:
-            try:
-                await self._poll_wallet(wallet)
-            except Exception as e:
-                logger.warning("poll_wallet_failed", wallet=wallet[:8], error=str(e))
+        """Poll all target wallets for new transactions (concurrently)."""
+        wallets = list(self.target_wallets)
+        results = await asyncio.gather(
+            *(self._poll_wallet(w) for w in wallets),
+            return_exceptions=True
+        )
+        
+        for wallet, result in zip(wallets, results):
+            if isinstance(result, Exception):
+                logger.warning("poll_wallet_failed", wallet=wallet[:8], error=str(result))
+    
+    async def _fetch_one(self, signature: str) -> Optional[Dict]:
+        """Fetch a single transaction, bounded by the shared semaphore."""
+        async with self._fetch_semaphore:
+            return await self._get_transaction(signature)
     
     async def _poll_wallet(self, wallet: str) -> None:
         """Poll a single wallet for new transactions."""
         signatures = await self._get_recent_signatures(wallet, limit=5)
         
-        for sig in signatures:
-            if sig in self.seen_signatures[wallet]:
-                continue
-            
-            # New transaction detected!
-            self.seen_signatures[wallet].add(sig)
-            
-            # Get full transaction details
-            tx_data = await self._get_transaction(sig)
-            if not tx_data:
-                continue
-            
-            # Create transaction object
-            tx = WalletTransaction(
-                signature=sig,
-                wallet=wallet,
-                timestamp=tx_data.get("blockTime", 0),
-                slot=tx_data.get("slot", 0),
-                success=tx_data.get("meta", {}).get("err") is None,
-                raw_tx=tx_data
-            )
-            
-            logger.info(
-                "new_transaction_detected",
-                wallet=wallet[:8] + "...",
-                signature=sig[:16] + "...",
-                success=tx.success
-            )
+        seen = self.seen_signatures[wallet]
+        new_signatures = [sig for sig in signatures if sig not in seen]
+        if not new_signatures:
+            return
+        
+        # New transactions detected! Claimed up front so the websocket path
+        # doesn't fetch them too while we wait
+        seen.update(new_signatures)
+        
+        # Fetch full transaction details in a single batched request
+        try:
+            results = await self._get_transactions(new_signatures)
+        except Exception:
+            # Nothing was fetched - let the next poll retry all of them
+            seen.difference_update(new_signatures)
+            raise
+        
+        # getSignaturesForAddress is newest first - hand them on oldest first so a
+        # trader's buy reaches the copy queue before their sell
+        for sig, tx_data in reversed(list(zip(new_signatures, results))):
+            if tx_data:
+                await self._emit_transaction(wallet, sig, tx_data)
+            else:
+                seen.discard(sig)  # Not returned this time - retry next poll
+    
+    async def _emit_transaction(self, wallet: str, sig: str, tx_data: Dict) -> None:
+        """Wrap a fetched transaction and hand it to the callback."""
+        # Create transaction object
+        tx = WalletTransaction(
+            signature=sig,
+            wallet=wallet,
+            timestamp=tx_data.get("blockTime", 0),
+            slot=tx_data.get("slot", 0),
+            success=tx_data.get("meta", {}).get("err") is None,
+            raw_tx=tx_data
+        )
+        
+        logger.info(
+            "new_transaction_detected",
+            wallet=self._wallet_short.get(wallet) or wallet[:8] + "...",
+            signature=sig[:16] + "...",
+            success=tx.success
+        )
+        
+        # Call the callback if provided
+        if self.on_transaction and tx.success:
+            try:
+                await self.on_transaction(tx)
+            except Exception as e:
+                logger.error("transaction_callback_error", error=str(e))
+    
+    async def _websocket_loop(self) -> None:
+        """Keep a logsSubscribe connection open, reconnecting with backoff."""
+        backoff = WS_RECONNECT_MIN_SECONDS
+        while self.running:
+            try:
+                async with self.session.ws_connect(self.ws_url, heartbeat=WS_HEARTBEAT_SECONDS) as ws:
+                    self._ws = ws
+                    self._ws_pending.clear()
+                    self._ws_subscriptions.clear()
+                    for wallet in list(self.target_wallets):
+                        await self._ws_subscribe(wallet)
+                    logger.info("wallet_ws_connected", wallets=len(self.target_wallets))
+                    backoff = WS_RECONNECT_MIN_SECONDS
+                    
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_ws_message(msg.json())
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("wallet_ws_error", error=str(e))
+            finally:
+                self._ws = None
             
-            # Call the callback if provided
-            if self.on_transaction and tx.success:
-                try:
-                    await self.on_transaction(tx)
-                except Exception as e:
-                    logger.error("transaction_callback_error", error=str(e))
+            if self.running:
+                logger.info("wallet_ws_reconnecting", delay=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, WS_RECONNECT_MAX_SECONDS)
+    
+    def _push_covers_all_wallets(self) -> bool:
+        """Whether the socket is up with a live subscription for every target wallet."""
+        if self._ws is None or self._ws.closed:
+            return False
+        subscribed = set(self._ws_subscriptions.values())
+        return all(w in subscribed for w in self.target_wallets)
+    
+    async def _ws_subscribe(self, wallet: str) -> None:
+        """Subscribe to logs mentioning one wallet (logsSubscribe takes a single address)."""
+        ws = self._ws
+        if ws is None or ws.closed:
+            return  # The next connect subscribes every target wallet
+        self._ws_request_id += 1
+        self._ws_pending[self._ws_request_id] = wallet
+        await ws.send_json({
+            "jsonrpc": "2.0",
+            "id": self._ws_request_id,
+            "method": "logsSubscribe",
+            "params": [{"mentions": [wallet]}, {"commitment": "confirmed"}]
+        })
+    
+    async def _ws_unsubscribe(self, subscription_id: int) -> None:
+        """Drop a logs subscription (no-op if the socket is already gone)."""
+        ws = self._ws
+        if ws is None or ws.closed:
+            return
+        self._ws_request_id += 1
+        await ws.send_json({
+            "jsonrpc": "2.0",
+            "id": self._ws_request_id,
+            "method": "logsUnsubscribe",
+            "params": [subscription_id]
+        })
+    
+    def _run_ws_call(self, coro, action: str, wallet: str) -> None:
+        """Send a subscribe/unsubscribe from sync code - the socket can close under it."""
+        async def run() -> None:
+            try:
+                await coro
+            except Exception as e:
+                logger.warning("wallet_ws_call_failed", action=action, wallet=wallet[:8], error=str(e))
+        
+        task = asyncio.create_task(run())
+        self._ws_tasks.add(task)
+        task.add_done_callback(self._ws_tasks.discard)
+    
+    def _handle_ws_message(self, data: Dict) -> None:
+        """Route a subscribe ack or a logs notification."""
+        if "id" in data:
+            wallet = self._ws_pending.pop(data["id"], None)
+            if wallet is not None and isinstance(data.get("result"), int):
+                if wallet in self.seen_signatures:
+                    self._ws_subscriptions[data["result"]] = wallet
+                else:
+                    # Removed while the subscribe was in flight
+                    self._run_ws_call(self._ws_unsubscribe(data["result"]), "unsubscribe", wallet)
+            elif wallet is not None:
+                logger.warning("wallet_ws_subscribe_failed", wallet=wallet[:8], error=str(data.get("error")))
+            return
+        
+        if data.get("method") != "logsNotification":
+            return
+        params = data.get("params", {})
+        wallet = self._ws_subscriptions.get(params.get("subscription"))
+        value = params.get("result", {}).get("value", {})
+        sig = value.get("signature")
+        if wallet is None or not sig or value.get("err") is not None:
+            return
+        
+        seen = self.seen_signatures.get(wallet)
+        if seen is None or sig in seen:
+            return
+        seen.add(sig)
+        
+        # Fetch off the reader so the next notification isn't held up
+        task = asyncio.create_task(self._handle_pushed_signature(wallet, sig))
+        self._ws_tasks.add(task)
+        task.add_done_callback(self._ws_tasks.discard)
+    
+    async def _handle_pushed_signature(self, wallet: str, sig: str) -> None:
+        """Fetch and emit a transaction announced over the websocket."""
+        try:
+            async with self._fetch_semaphore:
+                # Pushed at confirmed - the default finalized read wouldn't see it yet
+                tx_data = await self._get_transaction(sig, commitment="confirmed")
+        except Exception as e:
+            tx_data = None
+            logger.debug("pushed_tx_fetch_failed", signature=sig[:16], error=str(e))
+        
+        if not tx_data:
+            # Let the backstop poll pick it up
+            self.seen_signatures.get(wallet, set()).discard(sig)
+            return
+        await self._emit_transaction(wallet, sig, tx_data)
     
     def add_wallet(self, wallet: str) -> None:
         """Add a new wallet to monitor."""
         if wallet not in self.target_wallets:
             self.target_wallets.append(wallet)
             self.seen_signatures[wallet] = set()
+            self._wallet_short[wallet] = wallet[:8] + "..."
+            if self._ws is not None and not self._ws.closed:
+                self._run_ws_call(self._ws_subscribe(wallet), "subscribe", wallet)
             logger.info("wallet_added", wallet=wallet[:8] + "...")
     
     def remove_wallet(self, wallet: str) -> None:
@@ -191,4 +429,8 @@ class WalletMonitor:
         if wallet in self.target_wallets:
             self.target_wallets.remove(wallet)
             del self.seen_signatures[wallet]
+            self._wallet_short.pop(wallet, None)
+            for sub_id in [sid for sid, w in self._ws_subscriptions.items() if w == wallet]:
+                del self._ws_subscriptions[sub_id]
+                self._run_ws_call(self._ws_unsubscribe(sub_id), "unsubscribe", wallet)
             logger.info("wallet_removed", wallet=wallet[:8] + "...")
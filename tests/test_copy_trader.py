@@ -0,0 +1,351 @@
+"""
+Unit tests for copy trader lookups and trade sizing.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from src.copy_trader import (
+    BUY_COST_OVERHEAD_LAMPORTS,
+    CopyTrader,
+    CopyTradeResult,
+    NATIVE_SOL,
+)
+from src.tx_parser import ParsedSwap, SwapType
+
+
+@dataclass
+class MockConfig:
+    slippage_bps: int = 100
+    copy_balance_pct: float = 50.0
+    copy_max_sol: float = 0.5
+    copy_min_sol: float = 0.05
+    copy_sells: bool = True
+    copy_proportional: bool = False
+    fee_reserve_sol: float = 0.05
+    exit_fee_reserve: float = 0.001
+    max_positions: int = 3
+    min_market_cap_usd: float = 0
+    min_token_age_minutes: float = 0
+    min_liquidity_usd: float = 0
+    min_volume_24h_usd: float = 0
+    max_price_change_1h_pct: float = 0
+    min_txns_1h: int = 0
+    max_top10_holders_pct: float = 0
+    max_dev_holdings_pct: float = 0
+    min_holders_count: int = 0
+    trust_trader_pumpfun: bool = False
+    balance_cache_ms: int = 5000
+    mock_trading: bool = False
+    mock_balance_sol: float = 1.0
+
+
+def make_trader(**overrides) -> CopyTrader:
+    """Copy trader with a mock RPC client and no target wallets."""
+    return CopyTrader(MockConfig(**overrides), [], Keypair(), AsyncMock())
+
+
+def dex_pair(mint: str, market_cap: float, liquidity: float = 1000.0) -> dict:
+    """A DexScreener pair for mint against SOL."""
+    return {
+        "baseToken": {"address": mint},
+        "quoteToken": {"address": NATIVE_SOL},
+        "marketCap": market_cap,
+        "liquidity": {"usd": liquidity},
+        "volume": {"h24": 500.0},
+        "txns": {"h1": {"buys": 3, "sells": 2}},
+        "priceChange": {"h1": 12.0},
+        "pairCreatedAt": (time.time() - 600) * 1000,
+    }
+
+
+class FakeDexResponse:
+    """Minimal stand-in for an aiohttp response."""
+    
+    def __init__(self, status: int, body: dict):
+        self.status = status
+        self._body = body
+    
+    async def read(self) -> bytes:
+        return orjson.dumps(self._body)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeDexSession:
+    """Records requested mints and answers with the pairs known for them."""
+    
+    def __init__(self, pairs: dict, status: int = 200):
+        self.pairs = pairs  # mint -> pairs returned when that mint is asked for
+        self.status = status
+        self.requests = []
+    
+    def get(self, url, timeout=None):
+        mints = url.rsplit("/", 1)[1].split(",")
+        self.requests.append(mints)
+        found = [pair for mint in mints for pair in self.pairs.get(mint, [])]
+        return FakeDexResponse(self.status, {"pairs": found})
+
+
+MINT_A = str(Pubkey.new_unique())
+MINT_B = str(Pubkey.new_unique())
+TRADER = str(Pubkey.new_unique())
+
+
+def buy_swap(sol_amount: int, dex: str = "raydium") -> ParsedSwap:
+    """A trader's buy of MINT_A for sol_amount lamports."""
+    return ParsedSwap(
+        swap_type=SwapType.BUY,
+        token_mint=MINT_A,
+        token_symbol=None,
+        sol_amount=sol_amount,
+        token_amount=1_000_000,
+        dex=dex,
+        signature="sig",
+        wallet=TRADER,
+    )
+
+
+@pytest.mark.asyncio
+class TestTokenInfoBatching:
+    """Test DexScreener lookups sharing one multi-token request."""
+    
+    async def test_concurrent_callers_share_one_request(self):
+        """Test lookups made together go out as one request, one entry per mint."""
+        trader = make_trader()
+        trader.session = FakeDexSession({
+            MINT_A: [dex_pair(MINT_A, 50_000)],
+            MINT_B: [dex_pair(MINT_B, 80_000)],
+        })
+        
+        info_a, info_b, info_a_again = await asyncio.gather(
+            trader._get_token_info(MINT_A),
+            trader._get_token_info(MINT_B),
+            trader._get_token_info(MINT_A),
+        )
+        
+        assert trader.session.requests == [[MINT_A, MINT_B]]
+        assert info_a[0] == 50_000
+        assert info_b[0] == 80_000
+        assert info_a_again == info_a
+        assert info_a[5] == 5  # buys + sells in the last hour
+    
+    async def test_cached_mint_skips_request(self):
+        """Test a mint looked up recently is answered from the cache."""
+        trader = make_trader()
+        trader.session = FakeDexSession({MINT_A: [dex_pair(MINT_A, 50_000)]})
+        
+        await trader._get_token_info(MINT_A)
+        info = await trader._get_token_info(MINT_A)
+        
+        assert len(trader.session.requests) == 1
+        assert info[0] == 50_000
+    
+    async def test_mint_missing_from_batch_is_requested_alone(self):
+        """Test a mint crowded out of the batch response is asked for on its own."""
+        trader = make_trader()
+        session = FakeDexSession({MINT_A: [dex_pair(MINT_A, 50_000)]})
+        trader.session = session
+        
+        def get(url, timeout=None):
+            # MINT_B only shows up when it's requested by itself
+            if url.endswith(f"/{MINT_B}"):
+                session.pairs[MINT_B] = [dex_pair(MINT_B, 80_000)]
+            return FakeDexSession.get(session, url, timeout)
+        session.get = get
+        
+        info_a, info_b = await asyncio.gather(
+            trader._get_token_info(MINT_A),
+            trader._get_token_info(MINT_B),
+        )
+        
+        assert session.requests == [[MINT_A, MINT_B], [MINT_B]]
+        assert info_a[0] == 50_000
+        assert info_b[0] == 80_000
+    
+    async def test_failed_request_resolves_every_caller(self):
+        """Test every waiting caller gets empty info when the request fails."""
+        trader = make_trader()
+        trader.session = FakeDexSession({MINT_A: [dex_pair(MINT_A, 50_000)]}, status=500)
+        
+        results = await asyncio.wait_for(asyncio.gather(
+            trader._get_token_info(MINT_A),
+            trader._get_token_info(MINT_B),
+        ), timeout=1)
+        
+        assert results == [(0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 0)]
+        # A failed batch isn't retried per mint, and nothing is cached
+        assert len(trader.session.requests) == 1
+        assert MINT_A not in trader.token_info_cache
+
+
+@pytest.mark.asyncio
+class TestTradeSizing:
+    """Test trade sizing in integer lamports."""
+    
+    async def test_fixed_uses_configured_percentage(self):
+        """Test fixed sizing takes the exact configured share of available."""
+        trader = make_trader(copy_balance_pct=12.5, copy_max_sol=10.0)
+        
+        size = await trader._size_trade_fixed(1_000_000_000, buy_swap(1_000_000_000))
+        
+        assert size == 125_000_000
+    
+    async def test_fixed_is_capped(self):
+        """Test fixed sizing stops at the max trade and at twice the trader's buy."""
+        trader = make_trader(copy_balance_pct=50.0, copy_max_sol=0.3)
+        
+        assert await trader._size_trade_fixed(1_000_000_000, buy_swap(1_000_000_000)) == 300_000_000
+        assert await trader._size_trade_fixed(1_000_000_000, buy_swap(100_000_000)) == 200_000_000
+    
+    async def test_proportional_matches_trader_share(self):
+        """Test proportional sizing bets the same share of our balance as the trader did."""
+        trader = make_trader(copy_proportional=True, copy_max_sol=10.0)
+        trader._trader_balance_cache[TRADER] = (10.0, time.monotonic() + 60)
+        
+        # Trader put 4 of their 10 SOL in
+        size = await trader._size_trade_proportional(1_000_000_000, buy_swap(4_000_000_000))
+        
+        assert size == 400_000_000
+        trader.rpc.get_balance.assert_not_called()
+    
+    async def test_proportional_floor_and_caps(self):
+        """Test proportional sizing has a 15% floor, a 50% ceiling and the max trade cap."""
+        trader = make_trader(copy_proportional=True, copy_max_sol=10.0)
+        trader._trader_balance_cache[TRADER] = (10.0, time.monotonic() + 60)
+        
+        # 1% of their balance -> 15% floor
+        assert await trader._size_trade_proportional(1_000_000_000, buy_swap(100_000_000)) == 150_000_000
+        # 90% of their balance -> never more than half of ours
+        assert await trader._size_trade_proportional(1_000_000_000, buy_swap(9_000_000_000)) == 500_000_000
+        
+        trader._max_trade_lamports = 200_000_000
+        assert await trader._size_trade_proportional(1_000_000_000, buy_swap(4_000_000_000)) == 200_000_000
+    
+    async def test_proportional_with_nothing_available(self):
+        """Test proportional sizing of an empty balance is zero, not a division error."""
+        trader = make_trader(copy_proportional=True)
+        trader._trader_balance_cache[TRADER] = (10.0, time.monotonic() + 60)
+        
+        assert await trader._size_trade_proportional(0, buy_swap(1_000_000_000)) == 0
+
+
+class TestTradeRounding:
+    """Test rounding trade sizes to SOL steps."""
+    
+    def test_round_trade_lamports(self):
+        """Test sizes round to the nearest 0.0001 SOL."""
+        assert CopyTrader._round_trade_lamports(49_990_000) == 50_000_000
+        assert CopyTrader._round_trade_lamports(1_234_567) == 1_200_000
+        assert CopyTrader._round_trade_lamports(150_000) == 200_000
+        assert CopyTrader._round_trade_lamports(149_999) == 100_000
+        assert CopyTrader._round_trade_lamports(0) == 0
+
+
+@pytest.mark.asyncio
+class TestFeeReserve:
+    """Test the fee reserve boundary on the buy path."""
+    
+    def make_buying_trader(self, balance: int) -> CopyTrader:
+        """Trader whose RPC reports balance and whose pump.fun buys always land."""
+        trader = make_trader(trust_trader_pumpfun=True)
+        trader.rpc.get_balance = AsyncMock(return_value=balance)
+        trader._execute_pumpfun_swap = AsyncMock(return_value=CopyTradeResult(success=True, signature="ours"))
+        return trader
+    
+    async def test_exactly_enough_buys_minimum(self):
+        """Test a balance of exactly reserve + exit fee + min trade buys the minimum."""
+        balance = 50_000_000 + 1_000_000 + 50_000_000
+        trader = self.make_buying_trader(balance)
+        
+        with patch("src.copy_trader.trade_logger", MagicMock()):
+            result = await trader._execute_copy(buy_swap(1_000_000_000, dex="pump.fun"))
+        
+        assert result.success
+        assert result.our_sol_amount == 50_000_000
+        trader._execute_pumpfun_swap.assert_awaited_once()
+    
+    async def test_one_lamport_short_is_skipped(self):
+        """Test one lamport under the boundary is rejected before any swap."""
+        balance = 50_000_000 + 1_000_000 + 50_000_000 - 1
+        trader = self.make_buying_trader(balance)
+        
+        result = await trader._execute_copy(buy_swap(1_000_000_000, dex="pump.fun"))
+        
+        assert not result.success
+        assert result.error.startswith("insufficient_balance")
+        trader._execute_pumpfun_swap.assert_not_awaited()
+    
+    async def test_reservations_released(self):
+        """Test a finished buy gives back its position slot and lamports."""
+        trader = self.make_buying_trader(1_000_000_000)
+        
+        with patch("src.copy_trader.trade_logger", MagicMock()):
+            await trader._execute_copy(buy_swap(1_000_000_000, dex="pump.fun"))
+        
+        assert trader._reserved_positions == 0
+        assert trader._reserved_lamports == 0
+
+
+class TestBalanceCache:
+    """Test our cached SOL balance."""
+    
+    @pytest.mark.asyncio
+    async def test_debit_then_refetch_when_dirty(self):
+        """Test a buy is debited from the cache and a sell forces a refetch."""
+        trader = make_trader()
+        trader.rpc.get_balance = AsyncMock(side_effect=[1_000_000_000, 700_000_000])
+        
+        assert await trader._get_our_balance() == 1_000_000_000
+        assert await trader._get_our_balance() == 1_000_000_000
+        assert trader.rpc.get_balance.await_count == 1
+        
+        trader._debit_balance(100_000_000)
+        assert await trader._get_our_balance() == 1_000_000_000 - 100_000_000 - BUY_COST_OVERHEAD_LAMPORTS
+        assert trader.rpc.get_balance.await_count == 1
+        
+        trader._invalidate_balance()
+        assert await trader._get_our_balance() == 700_000_000
+        assert trader.rpc.get_balance.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_debit_keeps_fetch_time(self):
+        """Test a debited balance still expires on the original fetch's schedule."""
+        trader = make_trader(balance_cache_ms=1000)
+        trader.rpc.get_balance = AsyncMock(return_value=500_000_000)
+        trader._store_balance(1_000_000_000)
+        balance, _ = trader._balance_cache
+        trader._balance_cache = (balance, time.monotonic() - 2)
+        
+        trader._debit_balance(100_000_000)
+        
+        assert await trader._get_our_balance() == 500_000_000
+    
+    @pytest.mark.asyncio
+    async def test_debit_without_cache_marks_dirty(self):
+        """Test debiting an empty cache leaves it to be fetched next time."""
+        trader = make_trader()
+        
+        trader._debit_balance(100_000_000)
+        
+        assert trader._balance_cache is None
+        assert trader._balance_dirty
+    
+    def test_latest_balance_sees_debits(self):
+        """Test re-checking a balance read before a concurrent buy was debited."""
+        trader = make_trader()
+        trader._store_balance(1_000_000_000)
+        trader._debit_balance(200_000_000)
+        
+        assert trader._latest_balance(1_000_000_000) == 1_000_000_000 - 200_000_000 - BUY_COST_OVERHEAD_LAMPORTS
@@ -0,0 +1,202 @@
+"""
+Unit tests for the RPC client's transparent request batching.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+from solders.pubkey import Pubkey
+
+from src.rpc import RPCClient, RPC_BATCH_MAX_CALLS
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+    
+    def __init__(self, status: int, body):
+        self.status = status
+        self._body = body
+    
+    async def json(self, content_type=None):
+        return self._body
+    
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records every JSON-RPC payload posted and answers with handler(payload)."""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.payloads = []
+    
+    def post(self, url, json=None, headers=None):
+        self.payloads.append(json)
+        status, body = self.handler(json)
+        return FakeResponse(status, body)
+
+
+def balance_result(pubkey: str) -> dict:
+    """Deterministic fake getBalance result for a pubkey."""
+    return {"context": {"slot": 1}, "value": sum(bytes(Pubkey.from_string(pubkey)))}
+
+
+def answer_balances(payload):
+    """Answer a single getBalance call or a batch of them."""
+    if isinstance(payload, list):
+        return 200, [
+            {"jsonrpc": "2.0", "id": call["id"], "result": balance_result(call["params"][0])}
+            for call in payload
+        ]
+    return 200, {"jsonrpc": "2.0", "id": payload["id"], "result": balance_result(payload["params"][0])}
+
+
+def make_client(handler) -> tuple[RPCClient, FakeSession]:
+    """RPC client wired to a fake session, with the rate limiter out of the way."""
+    client = RPCClient(SimpleNamespace(rpc_url="http://rpc.test"))
+    session = FakeSession(handler)
+    client._get_session = AsyncMock(return_value=session)
+    client.rate_limiter.acquire = AsyncMock()
+    return client, session
+
+
+def pubkeys(n: int) -> list[Pubkey]:
+    """n distinct throwaway pubkeys."""
+    return [Pubkey.new_unique() for _ in range(n)]
+
+
+@pytest.mark.asyncio
+class TestBatchedRequests:
+    """Concurrent small reads share one JSON-RPC batch."""
+    
+    async def test_single_call_is_sent_unbatched(self):
+        """A lone call goes out as a plain request."""
+        client, session = make_client(answer_balances)
+        pk = pubkeys(1)[0]
+        
+        balance = await client.get_balance(pk)
+        
+        assert balance == balance_result(str(pk))["value"]
+        assert len(session.payloads) == 1
+        assert isinstance(session.payloads[0], dict)
+    
+    async def test_out_of_order_ids_are_matched(self):
+        """Responses are matched to callers by id, not by position."""
+        def reversed_answers(payload):
+            status, body = answer_balances(payload)
+            return status, list(reversed(body))
+        
+        client, session = make_client(reversed_answers)
+        pks = pubkeys(3)
+        
+        balances = await asyncio.gather(*(client.get_balance(pk) for pk in pks))
+        
+        assert balances == [balance_result(str(pk))["value"] for pk in pks]
+        assert len(session.payloads) == 1
+        assert len(session.payloads[0]) == 3
+    
+    async def test_item_error_fails_only_that_call(self):
+        """A per-item error raises for its caller with the RPC's message."""
+        pks = pubkeys(3)
+        bad = str(pks[1])
+        
+        def one_error(payload):
+            status, body = answer_balances(payload)
+            for item in body:
+                if payload[item["id"]]["params"][0] == bad:
+                    del item["result"]
+                    item["error"] = {"code": -32602, "message": "Invalid param: bad pubkey"}
+            return status, body
+        
+        client, _ = make_client(one_error)
+        
+        results = await asyncio.gather(*(client.get_balance(pk) for pk in pks), return_exceptions=True)
+        
+        assert results[0] == balance_result(str(pks[0]))["value"]
+        assert isinstance(results[1], Exception)
+        assert "Invalid param: bad pubkey" in str(results[1])
+        assert results[2] == balance_result(str(pks[2]))["value"]
+    
+    async def test_calls_split_at_max_batch_size(self):
+        """More than RPC_BATCH_MAX_CALLS concurrent calls go out as several batches."""
+        client, session = make_client(answer_balances)
+        pks = pubkeys(RPC_BATCH_MAX_CALLS + 4)
+        
+        balances = await asyncio.gather(*(client.get_balance(pk) for pk in pks))
+        
+        assert balances == [balance_result(str(pk))["value"] for pk in pks]
+        assert [len(p) for p in session.payloads] == [RPC_BATCH_MAX_CALLS, 4]
+
+
+@pytest.mark.asyncio
+class TestBatchFallback:
+    """RPCs that reject a batch get individual calls instead."""
+    
+    async def test_batch_unsupported_falls_back_for_good(self):
+        """An explicit 'no batches' error switches to single calls from then on."""
+        def no_batches(payload):
+            if isinstance(payload, list):
+                return 403, {"jsonrpc": "2.0", "error": {
+                    "code": -32403, "message": "Batch requests are only available for paid plans"
+                }}
+            return answer_balances(payload)
+        
+        client, session = make_client(no_batches)
+        pks = pubkeys(3)
+        
+        balances = await asyncio.gather(*(client.get_balance(pk) for pk in pks))
+        
+        assert balances == [balance_result(str(pk))["value"] for pk in pks]
+        assert client._batch_supported is False
+        # One rejected batch, then each call on its own
+        assert isinstance(session.payloads[0], list)
+        assert all(isinstance(p, dict) for p in session.payloads[1:])
+        assert len(session.payloads) == 4
+        
+        # Later batches skip straight to single calls
+        session.payloads.clear()
+        await client.get_balances(pks)
+        assert len(session.payloads) == 3
+        assert all(isinstance(p, dict) for p in session.payloads)
+    
+    async def test_other_rejection_falls_back_once(self):
+        """A 413 only sends that batch as single calls - batching stays on."""
+        def too_large(payload):
+            if isinstance(payload, list):
+                return 413, {"jsonrpc": "2.0", "error": {"code": -32600, "message": "Payload too large"}}
+            return answer_balances(payload)
+        
+        client, session = make_client(too_large)
+        pks = pubkeys(2)
+        
+        balances = await asyncio.gather(*(client.get_balance(pk) for pk in pks))
+        
+        assert balances == [balance_result(str(pk))["value"] for pk in pks]
+        assert client._batch_supported is True
+        assert len(session.payloads) == 3
+    
+    async def test_get_balances_reports_failed_lookups_as_none(self):
+        """get_balances keeps going when one account's lookup errors."""
+        pks = pubkeys(2)
+        
+        def second_fails(payload):
+            status, body = answer_balances(payload)
+            body[1] = {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "boom"}}
+            return status, body
+        
+        client, _ = make_client(second_fails)
+        
+        balances = await client.get_balances(pks)
+        
+        assert balances == [balance_result(str(pks[0]))["value"], None]
@@ -0,0 +1,237 @@
+"""
+Unit tests for the wallet monitor's websocket push path and polling backstop.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.wallet_monitor import WalletMonitor, WS_BACKSTOP_POLL_SECONDS
+
+WALLET_A = "WalletAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+WALLET_B = "WalletBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBB"
+TX = {"blockTime": 1, "slot": 1, "meta": {"err": None}}
+
+
+class FakeWebSocket:
+    """Records what's sent over the socket."""
+    
+    def __init__(self):
+        self.closed = False
+        self.sent = []
+    
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def make_monitor(wallets=(WALLET_A,)) -> WalletMonitor:
+    """Monitor with a live fake socket, mocked RPC lookups and a mock callback."""
+    monitor = WalletMonitor(
+        rpc_url="http://rpc.test",
+        target_wallets=list(wallets),
+        poll_interval_ms=1000,
+        on_transaction=AsyncMock(),
+        ws_url="ws://rpc.test"
+    )
+    monitor._ws = FakeWebSocket()
+    monitor._get_recent_signatures = AsyncMock(return_value=[])
+    monitor._get_transaction = AsyncMock(return_value=TX)
+    monitor._get_transactions = AsyncMock(side_effect=lambda sigs: [TX] * len(sigs))
+    return monitor
+
+
+async def subscribe(monitor: WalletMonitor, wallet: str, subscription_id: int) -> None:
+    """Subscribe a wallet and ack it."""
+    await monitor._ws_subscribe(wallet)
+    monitor._handle_ws_message({"jsonrpc": "2.0", "id": monitor._ws_request_id, "result": subscription_id})
+
+
+def notification(subscription_id: int, sig: str) -> dict:
+    """A logsNotification for sig."""
+    return {
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "subscription": subscription_id,
+            "result": {"context": {"slot": 1}, "value": {"signature": sig, "err": None, "logs": []}}
+        }
+    }
+
+
+async def drain(monitor: WalletMonitor) -> None:
+    """Wait for the fetches and socket calls the monitor spawned."""
+    while monitor._ws_tasks:
+        await asyncio.gather(*monitor._ws_tasks)
+
+
+@pytest.mark.asyncio
+class TestPushDedup:
+    """Test a signature seen by both push and poll is handled once."""
+    
+    async def test_pushed_then_polled(self):
+        """Test a pushed signature isn't fetched again by the next poll."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        
+        monitor._handle_ws_message(notification(7, "sig1"))
+        await drain(monitor)
+        monitor._get_recent_signatures.return_value = ["sig1"]
+        await monitor._poll_wallet(WALLET_A)
+        
+        monitor._get_transaction.assert_awaited_once_with("sig1", commitment="confirmed")
+        monitor._get_transactions.assert_not_awaited()
+        assert monitor.on_transaction.await_count == 1
+    
+    async def test_polled_then_pushed(self):
+        """Test a notification for a signature the poll is still fetching is dropped."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        release = asyncio.Event()
+        
+        async def slow_fetch(sigs):
+            await release.wait()
+            return [TX] * len(sigs)
+        monitor._get_transactions = AsyncMock(side_effect=slow_fetch)
+        monitor._get_recent_signatures.return_value = ["sig1"]
+        
+        poll = asyncio.create_task(monitor._poll_wallet(WALLET_A))
+        await asyncio.sleep(0)
+        monitor._handle_ws_message(notification(7, "sig1"))
+        release.set()
+        await poll
+        await drain(monitor)
+        
+        monitor._get_transaction.assert_not_awaited()
+        assert monitor.on_transaction.await_count == 1
+    
+    async def test_failed_push_fetch_left_to_poll(self):
+        """Test a pushed signature that couldn't be fetched is picked up by the poll."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        monitor._get_transaction.return_value = None
+        
+        monitor._handle_ws_message(notification(7, "sig1"))
+        await drain(monitor)
+        assert "sig1" not in monitor.seen_signatures[WALLET_A]
+        
+        monitor._get_recent_signatures.return_value = ["sig1"]
+        await monitor._poll_wallet(WALLET_A)
+        
+        monitor._get_transactions.assert_awaited_once_with(["sig1"])
+        assert monitor.on_transaction.await_count == 1
+    
+    async def test_failed_transaction_ignored(self):
+        """Test a notification for a failed transaction isn't fetched."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        message = notification(7, "sig1")
+        message["params"]["result"]["value"]["err"] = {"InstructionError": [0, "Custom"]}
+        
+        monitor._handle_ws_message(message)
+        await drain(monitor)
+        
+        monitor._get_transaction.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestPollingBackstop:
+    """Test the poll interval follows the subscription state."""
+    
+    async def poll_delay(self, monitor: WalletMonitor) -> float:
+        """Run one iteration of the polling loop and return how long it slept."""
+        monitor.ws_url = None  # The socket is faked - don't open a real one
+        monitor._initialize_seen_signatures = AsyncMock()
+        monitor._poll_all_wallets = AsyncMock()
+        
+        async def stop_after_one(delay):
+            monitor.running = False
+        sleep = AsyncMock(side_effect=stop_after_one)
+        
+        with patch("src.wallet_monitor.aiohttp.ClientSession", MagicMock()), \
+                patch("src.wallet_monitor.asyncio.sleep", sleep):
+            await monitor.start()
+        return sleep.await_args.args[0]
+    
+    async def test_slow_poll_while_every_wallet_is_pushed(self):
+        """Test polling backs off while every wallet has a live subscription."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        
+        assert monitor._push_covers_all_wallets()
+        assert await self.poll_delay(monitor) == WS_BACKSTOP_POLL_SECONDS
+    
+    async def test_normal_poll_when_socket_drops(self):
+        """Test polling goes back to the normal interval once the socket closes."""
+        monitor = make_monitor()
+        await subscribe(monitor, WALLET_A, 7)
+        monitor._ws.closed = True
+        
+        assert not monitor._push_covers_all_wallets()
+        assert await self.poll_delay(monitor) == 1.0
+    
+    async def test_normal_poll_until_every_wallet_is_subscribed(self):
+        """Test a wallet without a subscription yet keeps the normal interval."""
+        monitor = make_monitor([WALLET_A, WALLET_B])
+        await subscribe(monitor, WALLET_A, 7)
+        await monitor._ws_subscribe(WALLET_B)  # Not acked
+        
+        assert not monitor._push_covers_all_wallets()
+        assert await self.poll_delay(monitor) == 1.0
+    
+    async def test_failed_subscribe_keeps_normal_poll(self):
+        """Test a rejected subscribe leaves the wallet on normal polling."""
+        monitor = make_monitor()
+        await monitor._ws_subscribe(WALLET_A)
+        monitor._handle_ws_message({
+            "jsonrpc": "2.0", "id": monitor._ws_request_id, "error": {"code": -32603, "message": "nope"}
+        })
+        
+        assert not monitor._push_covers_all_wallets()
+
+
+@pytest.mark.asyncio
+class TestWalletChanges:
+    """Test subscriptions follow wallets being added and removed."""
+    
+    async def test_add_wallet_subscribes(self):
+        """Test an added wallet is subscribed on the open socket."""
+        monitor = make_monitor()
+        
+        monitor.add_wallet(WALLET_B)
+        await drain(monitor)
+        
+        assert monitor._ws.sent[-1]["method"] == "logsSubscribe"
+        assert monitor._ws.sent[-1]["params"][0] == {"mentions": [WALLET_B]}
+    
+    async def test_remove_wallet_unsubscribes(self):
+        """Test a removed wallet's subscription is dropped."""
+        monitor = make_monitor([WALLET_A, WALLET_B])
+        await subscribe(monitor, WALLET_A, 7)
+        await subscribe(monitor, WALLET_B, 8)
+        
+        monitor.remove_wallet(WALLET_B)
+        await drain(monitor)
+        
+        assert monitor._ws.sent[-1]["method"] == "logsUnsubscribe"
+        assert monitor._ws.sent[-1]["params"] == [8]
+        assert monitor._ws_subscriptions == {7: WALLET_A}
+        
+        # Late notifications for it are ignored
+        monitor._handle_ws_message(notification(8, "sig1"))
+        await drain(monitor)
+        monitor._get_transaction.assert_not_awaited()
+    
+    async def test_removed_while_subscribing(self):
+        """Test a wallet removed before its subscribe was acked is unsubscribed on the ack."""
+        monitor = make_monitor([WALLET_A, WALLET_B])
+        await monitor._ws_subscribe(WALLET_B)
+        request_id = monitor._ws_request_id
+        
+        monitor.remove_wallet(WALLET_B)
+        monitor._handle_ws_message({"jsonrpc": "2.0", "id": request_id, "result": 8})
+        await drain(monitor)
+        
+        assert monitor._ws.sent[-1]["method"] == "logsUnsubscribe"
+        assert monitor._ws.sent[-1]["params"] == [8]
+        assert 8 not in monitor._ws_subscriptions